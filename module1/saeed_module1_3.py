@@ -1,14 +1,97 @@
+import math
+import time
+from collections import OrderedDict
+
+# Ranges shorter than this are multiplied with a plain loop
+_SPLIT_CUTOFF = 32
+# How many computed factorials are kept as checkpoints for later calls
+_CACHE_SIZE = 64
+_cache = OrderedDict()
+
+
+# product of all integers lo * (lo + 1) * ... * (hi - 1), by binary splitting:
+# multiplying two halves of similar size is much cheaper than growing one
+# huge number by a small factor at every step
+def _product(lo, hi):
+    if hi - lo <= _SPLIT_CUTOFF:
+        result = 1
+        for i in range(lo, hi):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return _product(lo, mid) * _product(mid, hi)
+
+
+def _remember(n, value):
+    _cache[n] = value
+    _cache.move_to_end(n)
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
 # function to calculate the factorial of a number
+# reuses the closest cached factorial below n (multiplying up) when there is
+# one, otherwise builds n! with a product tree. Cached values above n are not
+# divided down: dividing two huge ints is quadratic and slower than rebuilding.
 def factorial(n):
     if n < 0:
         raise ValueError("Factorial is not defined for negative numbers")
     elif n == 0 or n == 1:
         return 1
+    if n in _cache:
+        _cache.move_to_end(n)
+        return _cache[n]
+
+    below = max((m for m in _cache if m < n), default=None)
+    if below is not None:
+        result = _cache[below] * _product(below + 1, n + 1)
     else:
-        result = 1
-        for i in range(2, n + 1):
-            result *= i
-        return result
+        result = _product(2, n + 1)
+    _remember(n, result)
+    return result
+
+
+def clear_factorial_cache():
+    _cache.clear()
+
+
+# number of ways to choose k items out of n, ignoring order; math.comb avoids
+# the big-int division a product / factorial(k) formula needs
+def binomial(n, k):
+    if k < 0 or k > n:
+        return 0
+    return math.comb(n, k)
+
+
+# number of ordered arrangements of k items out of n
+def permutations(n, k):
+    if k < 0 or k > n:
+        return 0
+    return _product(n - k + 1, n + 1)
+
+
+# the original sequential loop, kept for the benchmark
+def _factorial_loop(n):
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
+
+# compare the old loop, the product tree, a cached nearby request and math.factorial
+def benchmark(n=200_000):
+    timings = {}
+    clear_factorial_cache()
+    for name, func in (("loop", _factorial_loop), ("product_tree", factorial),
+                       ("cached_nearby", lambda m: factorial(m + 100)),
+                       ("math.factorial", math.factorial)):
+        start = time.perf_counter()
+        value = func(n)
+        timings[name] = round(time.perf_counter() - start, 4)
+        if name != "cached_nearby" and value != math.factorial(n):
+            raise AssertionError(f"{name} returned a wrong result")
+    return timings
+
 
 def print_variable_info(var):
     print(var)
@@ -23,3 +106,6 @@ def print_variable_info(var):
     result = print_variable_info("Hello")
     print("Returned:", result)
 
+
+if __name__ == "__main__":
+    print(benchmark())
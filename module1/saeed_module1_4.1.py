@@ -2,28 +2,181 @@
 # where SS is seconds, MM is minutes, HH is hours, DD is day, MM is month, and YYYY is year.
 # For example: (45:30:14 , 25/12/2024)
 # The function can be imported and used in other modules as needed.
-
+#
+# get_today_date() is called on every log line, so the string is cached:
+# the formatted date is reused until local midnight and the whole timestamp
+# until the clock reaches the next second. In between, a call is one clock
+# read and one comparison.
+#
+# TimestampFormatter(coarse=True) reads a coarse monotonic clock instead of
+# the wall clock (CLOCK_MONOTONIC_COARSE on Linux) and re-syncs with the wall
+# clock every RESYNC_SECONDS. format_many() formats a batch of epoch seconds
+# or a NumPy datetime64 array, formatting every distinct second only once.
+
+import time
 from datetime import datetime
 
-def get_today_date():
-    now = datetime.now()
-    return f"({now.strftime('%S:%M:%H')} , {now.strftime('%d/%m/%Y')})"
-
-# Example usage
-
-    print(get_today_date())
-
-# Note: The time format is in 24-hour format.
-
-
-
-
-
-
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RESYNC_SECONDS = 60.0
+
+if hasattr(time, "CLOCK_MONOTONIC_COARSE"):
+    def _coarse_clock():
+        return time.clock_gettime(time.CLOCK_MONOTONIC_COARSE)
+else:
+    _coarse_clock = time.monotonic
+
+
+class TimestampFormatter:
+    def __init__(self, coarse=False):
+        self.coarse = coarse
+        self._cached = (None, "")     # (epoch second, formatted timestamp)
+        self._day = (0, -1, "")       # (day start, next midnight, formatted date)
+        if coarse:
+            self._resync()
+
+    def _resync(self):
+        self._mono0 = _coarse_clock()
+        self._wall0 = time.time() - self._mono0
+        self._next_sync = self._mono0 + RESYNC_SECONDS
+
+    def _now(self):
+        if not self.coarse:
+            return time.time()
+        mono = _coarse_clock()
+        if mono >= self._next_sync:
+            self._resync()
+        return self._wall0 + mono
+
+    def _date(self, sec, tm):
+        start, end, text = self._day
+        if start <= sec < end:
+            return text
+        text = f"{tm.tm_mday:02d}/{tm.tm_mon:02d}/{tm.tm_year}"
+        # this and the next local midnight; mktime handles DST changes (days
+        # of 23 or 25 hours) and month ends
+        start = int(time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday, 0, 0, 0, 0, 0, -1)))
+        end = int(time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday + 1, 0, 0, 0, 0, 0, -1)))
+        self._day = (start, end, text)
+        return text
+
+    def format_epoch(self, sec):
+        sec = int(sec // 1)
+        tm = time.localtime(sec)
+        return f"({tm.tm_sec:02d}:{tm.tm_min:02d}:{tm.tm_hour:02d} , {self._date(sec, tm)})"
+
+    def now(self):
+        sec = int(self._now())
+        cached_sec, text = self._cached
+        if sec == cached_sec:
+            return text
+        text = self.format_epoch(sec)
+        self._cached = (sec, text)
+        return text
+
+    __call__ = now
+
+    def format_many(self, timestamps):
+        # epoch seconds (ints/floats) or a datetime64 array -> list of strings
+        if np is not None and isinstance(timestamps, np.ndarray):
+            if timestamps.dtype.kind == "M":
+                secs = timestamps.astype("datetime64[s]").astype(np.int64)
+            else:
+                secs = np.floor(timestamps).astype(np.int64)
+            unique, inverse = np.unique(secs, return_inverse=True)
+            texts = np.array([self.format_epoch(s) for s in unique.tolist()], dtype=object)
+            return texts[inverse.ravel()].tolist()
+        seen = {}
+        out = []
+        for t in timestamps:
+            sec = int(t // 1)
+            text = seen.get(sec)
+            if text is None:
+                text = seen[sec] = self.format_epoch(sec)
+            out.append(text)
+        return out
+
+
+_formatter = TimestampFormatter()
 
 
+def get_today_date():
+    return _formatter.now()
 
 
+def get_today_date_uncached():
+    now = datetime.now()
+    return f"({now.strftime('%S:%M:%H')} , {now.strftime('%d/%m/%Y')})"
 
 
+def benchmark(calls=1_000_000, batch=1_000_000):
+    # nanoseconds per call / per formatted timestamp
+    results = {}
+    coarse = TimestampFormatter(coarse=True)
+    for name, fn in (("uncached", get_today_date_uncached), ("cached", get_today_date),
+                     ("coarse", coarse.now)):
+        n = calls // 10 if name == "uncached" else calls
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        results[name + "_ns"] = round((time.perf_counter() - start) / n * 1e9)
+    # one day of log lines, several per second
+    stamps = [time.time() - 86400 + i * 86400 / batch for i in range(batch)]
+    start = time.perf_counter()
+    _formatter.format_many(stamps)
+    results["batch_list_ns"] = round((time.perf_counter() - start) / batch * 1e9)
+    if np is not None:
+        arr = np.array(stamps).astype(np.int64).astype("datetime64[s]")
+        start = time.perf_counter()
+        _formatter.format_many(arr)
+        results["batch_datetime64_ns"] = round((time.perf_counter() - start) / batch * 1e9)
+    return results
+
+
+def check_dst(tz="America/New_York", days=("2024-03-10", "2024-11-03")):
+    # formats every 5 minutes around the given DST change days, in shuffled
+    # order, under TZ=`tz` and compares with datetime; raises AssertionError
+    # on the first mismatch. Needs time.tzset (Unix).
+    import os
+    import random
+
+    saved = os.environ.get("TZ")
+    os.environ["TZ"] = tz
+    time.tzset()
+    try:
+        stamps = []
+        for day in days:
+            midnight = time.mktime(time.strptime(day, "%Y-%m-%d"))
+            stamps += [int(midnight) + i for i in range(-6 * 3600, 30 * 3600, 300)]
+        random.Random(0).shuffle(stamps)
+        checked = 0
+        for text, sec in zip(TimestampFormatter().format_many(stamps), stamps):
+            dt = datetime.fromtimestamp(sec)
+            expected = f"({dt.strftime('%S:%M:%H')} , {dt.strftime('%d/%m/%Y')})"
+            if text != expected:
+                raise AssertionError(f"{tz} {sec}: got {text}, expected {expected}")
+            checked += 1
+        return {"tz": tz, "checked": checked}
+    finally:
+        if saved is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = saved
+        time.tzset()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "check-dst":
+        for zone in ("America/New_York", "Europe/London", "Australia/Sydney"):
+            print(check_dst(zone))
+    else:
+        # Example usage
+        print(get_today_date())
+        print(benchmark())
 
+# Note: The time format is in 24-hour format.
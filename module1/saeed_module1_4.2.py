@@ -1,29 +1,134 @@
 # This module generates a Fibonacci sequence based on the current minute of the hour.
 # The length of the sequence is twice the current minute value.
 # For example, if the current minute is 15, the sequence will have 30 terms.
+#
+# Besides the list builder it has:
+#   fib(n)                 - the n-th term (F(0) = 0) by fast doubling, O(log n) steps, memoized
+#   fib_mod(n, m)          - F(n) mod m, fast doubling with every step reduced mod m
+#   pisano_period(m)       - period of F(i) mod m (O(m) steps, standalone helper)
+#   fibonacci_stream(n)    - lazy generator of the first n terms (endless if n is None)
+#   print_fibonacci_stream(n) - prints the first n terms one per line as they are generated
+#   benchmark(n)           - compares the list builder with fib(n)
+
+import sys
+import time
+from functools import lru_cache
+from itertools import islice
+
+def fibonacci_stream(n=None):
+    a, b = 0, 1
+    count = 0
+    while n is None or count < n:
+        yield a
+        a, b = b, a + b
+        count += 1
+
 
 def fibonacci(n):
     if n <= 0:
         return []
-    elif n == 1:
-        return [0]
-    elif n == 2:
-        return [0, 1]
-    else:
-        seq = [0, 1]
-        for i in range(2, n):
-            seq.append(seq[-1] + seq[-2])
-        return seq
+    return list(fibonacci_stream(n))
+
+
+# fast doubling, walking the bits of n from the top:
+#   F(2k)   = F(k) * (2 * F(k+1) - F(k))
+#   F(2k+1) = F(k+1)^2 + F(k)^2
+def _fib_pair(n, m=None):
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if m is not None:
+            c %= m
+            d %= m
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+        if m is not None:
+            b %= m
+    return a, b
+
+
+@lru_cache(maxsize=1024)
+def fib(n):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return _fib_pair(n)[0]
+
+
+@lru_cache(maxsize=128)
+def pisano_period(m):
+    # F(i) mod m repeats with this period; the period starts again at (0, 1)
+    a, b = 0, 1
+    for i in range(1, 6 * m + 1):
+        a, b = b, (a + b) % m
+        if a == 0 and b == 1:
+            return i
+    return 6 * m
+
 
+@lru_cache(maxsize=1024)
+def fib_mod(n, m):
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if m <= 0:
+        raise ValueError("m must be positive")
+    if m == 1:
+        return 0
+    # already O(log n); reducing n by the Pisano period first would cost O(m)
+    return _fib_pair(n, m)[0] % m
+
+
+def benchmark(n=100_000):
+    start = time.perf_counter()
+    from_list = fibonacci(n + 1)[-1]
+    list_time = time.perf_counter() - start
+
+    fib.cache_clear()
+    start = time.perf_counter()
+    fast = fib(n)
+    fast_time = time.perf_counter() - start
+
+    if fast != from_list:
+        raise AssertionError("fast doubling disagrees with the list builder")
+    start = time.perf_counter()
+    huge = fib_mod(10 ** 18, 1_000_000_007)
+    mod_time = time.perf_counter() - start
+    return {
+        "n": n,
+        "list_builder_s": round(list_time, 4),
+        "fast_doubling_s": round(fast_time, 4),
+        "fib_mod(10**18, 1e9+7)": huge,
+        "fib_mod_s": round(mod_time, 6),
+    }
+
+# the terms are printed one per line as they are generated; the sequence is
+# still returned as a list, as before
 def get_fibonacci_based_on_minute():
     minute = datetime.now().minute
     n = 2 * minute
-    seq = fibonacci(n)
     print(f"Fibonacci sequence for 2 * current minute ({minute}) = {n} terms:")
-    print(seq)
+    seq = []
+    print_fibonacci_stream(n, keep=seq)
     return seq
 from datetime import datetime
 
 
+# prints the terms one by one as they are generated, without building a list;
+# pass a list as `keep` to also collect them
+def print_fibonacci_stream(n, out=None, keep=None):
+    out = out or sys.stdout
+    for term in islice(fibonacci_stream(), n):
+        out.write(f"{term}\n")
+        if keep is not None:
+            keep.append(term)
+
+
 
 # note: To test this code, simply run the module. It will print the Fibonacci sequence based on the current minute.
+
+
+if __name__ == "__main__":
+    get_fibonacci_based_on_minute()
+    print(benchmark())
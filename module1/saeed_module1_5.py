@@ -6,29 +6,105 @@
 # Non-letter characters remain unchanged.
 # The function also counts the number of words and calculates
 # the total price based on a given price per letter.
-def shift_string_and_calculate(string, price_per_letter):
-    def shift_letter(c):
-        if c.islower():
-            return chr((ord(c) - ord('a') + 1) % 26 + ord('a'))
-        elif c.isupper():
-            return chr((ord(c) - ord('A') + 1) % 26 + ord('A'))
+#
+# The shifting is done with a precompiled str.translate table built by
+# TextShifter, so no Python code runs per character. The shift amount and
+# the alphabets (ranges of characters rotated among themselves) can be
+# configured, e.g. TextShifter(3, DEFAULT_RANGES + CYRILLIC_RANGES).
+# Letters outside the configured ranges are left as they are.
+#
+# For large inputs:
+#   shift_many(strings, price_per_letter, processes=None)  - iterable in, results out lazily
+#   shift_file(path, price_per_letter, processes=None)     - one result per line of a text file
+# With processes > 1 the work is spread over a multiprocessing pool.
+import multiprocessing
+import string as _string
+from collections import deque
+from itertools import islice
+
+DEFAULT_RANGES = (("a", "z"), ("A", "Z"))
+CYRILLIC_RANGES = (("\u0430", "\u044f"), ("\u0410", "\u042f"))
+GREEK_LOWER_RANGES = (("\u03b1", "\u03c9"),)
+
+# deleting ASCII letters and comparing lengths counts them at C speed
+_ASCII_LETTERS = str.maketrans("", "", _string.ascii_letters)
+
+
+class TextShifter:
+    def __init__(self, shift=1, ranges=DEFAULT_RANGES):
+        self.shift = shift
+        self.ranges = tuple(ranges)
+        self.table = {}
+        for first, last in self.ranges:
+            start, size = ord(first), ord(last) - ord(first) + 1
+            for i in range(size):
+                self.table[start + i] = start + (i + shift) % size
+
+    def shift_text(self, text):
+        return text.translate(self.table)
+
+    def calculate(self, text, price_per_letter):
+        if text.isascii():
+            letter_count = len(text) - len(text.translate(_ASCII_LETTERS))
         else:
-            return c
-    
-    shifted = ''.join(shift_letter(c) for c in string)
-    words = string.split()
-    word_count = len(words)
-    letter_count = sum(1 for c in string if c.isalpha())
-    price_of_string = letter_count * price_per_letter
-    
-    return {
-        "shifted_string": shifted,
-        "word_count": word_count,
-        "price_of_string": price_of_string
-    }
+            letter_count = sum(map(str.isalpha, text))
+        return {
+            "shifted_string": text.translate(self.table),
+            "word_count": len(text.split()),
+            "price_of_string": letter_count * price_per_letter
+        }
 
-# Example usage
 
+_default_shifter = TextShifter()
+
+
+def shift_string_and_calculate(string, price_per_letter):
+    return _default_shifter.calculate(string, price_per_letter)
+
+
+def _calculate_chunk(args):
+    shifter, chunk, price_per_letter = args
+    return [shifter.calculate(text, price_per_letter) for text in chunk]
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# yields one result dict per input string, in order, without reading
+# the whole input first; with a pool, at most 2 * processes chunks are in
+# flight (Pool.imap would read the whole input into its task queue)
+def shift_many(strings, price_per_letter, shifter=None, processes=None, chunk_size=10_000):
+    shifter = shifter or _default_shifter
+    if not processes or processes <= 1:
+        for text in strings:
+            yield shifter.calculate(text, price_per_letter)
+        return
+    window = 2 * processes
+    pending = deque()
+    with multiprocessing.Pool(processes) as pool:
+        for chunk in _chunks(strings, chunk_size):
+            if len(pending) >= window:
+                yield from pending.popleft().get()
+            pending.append(pool.apply_async(_calculate_chunk, ((shifter, chunk, price_per_letter),)))
+        while pending:
+            yield from pending.popleft().get()
+
+
+# same as shift_many for every line of a text file (line endings are dropped)
+def shift_file(path, price_per_letter, shifter=None, processes=None, chunk_size=10_000,
+               encoding="utf-8"):
+    with open(path, "r", encoding=encoding) as f:
+        lines = (line.rstrip("\r\n") for line in f)
+        yield from shift_many(lines, price_per_letter, shifter, processes, chunk_size)
+
+# Example usage
+if __name__ == "__main__":
     result = shift_string_and_calculate("Hello World", 0.5)
     print(result)
 
@@ -1,20 +1,144 @@
-
 # This module defines a Person class that stores personal information
 # and provides a method to save that information to a text file
 # including name, contact, address, and phone number.
+#
+# For whole populations:
+#   save_many(people, path, format="text" | "jsonl" | "csv")  - one file, buffered writes
+#   load_people(path, format=...)                           - yields Person objects lazily
+# The "text" format is the save_to_file layout, one record after another,
+# separated by a blank line. Person uses __slots__, so a million of them
+# take far less memory than regular objects.
+import csv
+import json
+import os
+import tempfile
+import time
+
+FIELDS = ("name", "contact", "address", "phone")
+FORMATS = ("text", "jsonl", "csv")
+# write buffer for save_many
+BUFFER_SIZE = 1 << 20
+
+
 class Person:
+    __slots__ = FIELDS
+
     def __init__(self, name, contact, address, phone):
         self.name = name
         self.contact = contact
         self.address = address
         self.phone = phone
-    
+
+    def __eq__(self, other):
+        if not isinstance(other, Person):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    # the fields are mutable, so a hash over them would go stale once one is
+    # assigned; equal-by-value people are therefore not hashable
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Person({self.name!r}, {self.contact!r}, {self.address!r}, {self.phone!r})"
+
+    def to_text(self):
+        return (f"Name: {self.name}\n"
+                f"Contact: {self.contact}\n"
+                f"Address: {self.address}\n"
+                f"Phone: {self.phone}\n")
+
     def save_to_file(self, filename):
         with open(filename, 'w') as f:
-            f.write(f"Name: {self.name}\n")
-            f.write(f"Contact: {self.contact}\n")
-            f.write(f"Address: {self.address}\n")
-            f.write(f"Phone: {self.phone}\n")
+            f.write(self.to_text())
         print(f"Person's information saved to {filename}")
 
 
+def save_many(people, path, format="text"):
+    # returns the number of people written
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    count = 0
+    newline = "" if format == "csv" else None
+    with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE, newline=newline) as f:
+        if format == "csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for p in people:
+                writer.writerow((p.name, p.contact, p.address, p.phone))
+                count += 1
+        elif format == "jsonl":
+            dumps = json.dumps
+            for p in people:
+                f.write(dumps({"name": p.name, "contact": p.contact,
+                               "address": p.address, "phone": p.phone},
+                              ensure_ascii=False) + "\n")
+                count += 1
+        else:
+            for p in people:
+                if count:
+                    f.write("\n")
+                f.write(p.to_text())
+                count += 1
+    return count
+
+
+def _load_text(f):
+    values = {}
+    for line in f:
+        line = line.rstrip("\n")
+        if not line:
+            continue
+        key, _, value = line.partition(": ")
+        key = key.lower()
+        if key not in FIELDS:
+            continue
+        if key == "name" and values:
+            yield Person(*(values.get(k, "") for k in FIELDS))
+            values = {}
+        values[key] = value
+    if values:
+        yield Person(*(values.get(k, "") for k in FIELDS))
+
+
+def load_people(path, format="text"):
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    newline = "" if format == "csv" else None
+    with open(path, "r", encoding="utf-8", newline=newline) as f:
+        if format == "csv":
+            reader = csv.reader(f)
+            next(reader, None)  # header
+            for row in reader:
+                yield Person(*row)
+        elif format == "jsonl":
+            for line in f:
+                if line.strip():
+                    d = json.loads(line)
+                    yield Person(d["name"], d["contact"], d["address"], d["phone"])
+        else:
+            yield from _load_text(f)
+
+
+def benchmark(n=1_000_000):
+    # writes and reads n people in every format, in a temporary directory
+    people = [Person(f"Person {i}", f"person{i}@example.com",
+                     f"{i} Main Street, Springfield", f"+1555{i:07d}")
+              for i in range(n)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            path = os.path.join(tmp, f"people.{fmt}")
+            start = time.perf_counter()
+            save_many(people, path, fmt)
+            saved = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = sum(1 for _ in load_people(path, fmt))
+            read = time.perf_counter() - start
+            results[fmt] = {"save_s": round(saved, 2), "load_s": round(read, 2),
+                            "loaded": loaded, "mb": round(os.path.getsize(path) / 1e6, 1)}
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    print(benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
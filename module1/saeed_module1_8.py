@@ -1,33 +1,128 @@
 # Function to read address from a file, count the words, and append the count back to the file
 # The file is expected to have a line starting with "Address: "
+#
+# The file is streamed line by line and the scan stops at the first address,
+# so memory use does not grow with the file. The count is appended through the
+# same handle that was used for reading (one open per call); read-only files
+# are opened for reading only and can still be scanned.
+#
+# For files holding many person records (see save_many in saeed_module1_6.py),
+# count_words_per_record() returns the word count of every record in one pass.
+# build_index() writes a sidecar "<file>.idx" with the byte offset of every
+# record's address line, so address_of(filename, i) seeks straight to it.
+import json
+import os
+
+ADDRESS = b"Address: "
+NAME = b"Name: "
+INDEX_SUFFIX = ".idx"
+
 
 def read_address_and_count_words(filename="person_address.txt"):
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-        
-        address_text = ""
-        for line in lines:
-            if line.startswith("Address: "):
-                address_text = line[len("Address: "):].strip()
-                break
-        
-        if not address_text:
-            return None
-        
-        word_count = len(address_text.split())
-        
-        # Append the word count to the file
-        with open(filename, 'a') as f:
-            f.write(f"\nWord count of address: {word_count}\n")
-        
+        try:
+            f = open(filename, 'rb+')
+        except PermissionError:
+            f = open(filename, 'rb')
+        with f:
+            address_text = ""
+            for line in f:
+                if line.startswith(ADDRESS):
+                    address_text = line[len(ADDRESS):].decode("utf-8").strip()
+                    break
+
+            if not address_text:
+                return None
+
+            word_count = len(address_text.split())
+
+            # Append the word count to the file
+            if not f.writable():
+                raise PermissionError(f"cannot append to read-only file {filename}")
+            f.seek(0, os.SEEK_END)
+            f.write(f"\nWord count of address: {word_count}\n".encode("utf-8"))
+
         return word_count
     except FileNotFoundError:
         print(f"File {filename} not found.")
         return None
 
-# Example usage
 
+def _scan_records(f):
+    # yields (address_offset, address_bytes) per record; a record starts at a
+    # "Name: " line, a file without any is treated as a single record
+    offset = 0
+    started = False
+    current = None
+    for line in f:
+        if line.startswith(NAME):
+            if started:
+                yield current
+            started = True
+            current = None
+        elif line.startswith(ADDRESS) and current is None:
+            started = True
+            current = (offset, line[len(ADDRESS):])
+        offset += len(line)
+    if started:
+        yield current
+
+
+def count_words_per_record(filename, append=False):
+    # one pass over the file; None for a record without an address line.
+    # With append=True all counts are written back in a single write.
+    with open(filename, 'rb+' if append else 'rb') as f:
+        counts = [None if rec is None else len(rec[1].split()) for rec in _scan_records(f)]
+        if append and counts:
+            f.seek(0, os.SEEK_END)
+            f.write("".join(f"\nWord count of address {i}: {c}\n"
+                            for i, c in enumerate(counts) if c is not None).encode("utf-8"))
+    return counts
+
+
+def build_index(filename):
+    with open(filename, 'rb') as f:
+        offsets = [None if rec is None else rec[0] for rec in _scan_records(f)]
+    st = os.stat(filename)
+    index = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "offsets": offsets}
+    with open(filename + INDEX_SUFFIX, 'w') as f:
+        json.dump(index, f)
+    return offsets
+
+
+def load_index(filename):
+    # rebuilds the sidecar when it is missing or the file changed since
+    try:
+        with open(filename + INDEX_SUFFIX) as f:
+            index = json.load(f)
+        st = os.stat(filename)
+        if index["size"] == st.st_size and index["mtime_ns"] == st.st_mtime_ns:
+            return index["offsets"]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    return build_index(filename)
+
+
+def address_of(filename, record, offsets=None):
+    if offsets is None:
+        offsets = load_index(filename)
+    offset = offsets[record]
+    if offset is None:
+        return None
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        return f.readline()[len(ADDRESS):].decode("utf-8").strip()
+
+
+def word_count_of(filename, record, offsets=None):
+    address = address_of(filename, record, offsets)
+    return None if address is None else len(address.split())
+
+
+if __name__ == "__main__":
+    # Example usage
+    word_count = read_address_and_count_words()
+    if word_count is not None:
         print(f"Word count appended: {word_count}")
 
 
@@ -38,4 +133,4 @@ def read_address_and_count_words(filename="person_address.txt"):
 # The function returns the word count if successful, or None if the address line is not found or the file is missing.
 
 
-#note: Make sure to create a file named "person_address.txt" with an appropriate address line for testing.
\ No newline at end of file
+#note: Make sure to create a file named "person_address.txt" with an appropriate address line for testing.
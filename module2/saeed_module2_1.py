@@ -1,5 +1,34 @@
-
 # A simple module to determine if a number is even or odd.
+#
+# Besides the single-value `even_or_odd`, the bulk functions classify a
+# whole NumPy array, Python iterable or newline-delimited stream in one
+# pass and return flags or counts instead of one string per item:
+#
+# - `classify(values)`  -> ParityResult: one "is even" flag per input,
+#   invalid entries listed separately (nothing is raised per item);
+# - `count_parity(values)` / `count_stream(file)` -> ParityCounts only.
+#
+# `count_stream` reads binary blocks and, with NumPy installed, checks
+# plain `[+-]digits` lines with array operations: the parity of a decimal
+# number is the parity of its last digit, so numbers of any length are
+# never converted to int. Other lines go through `int()` as usual. Memory
+# use is bounded by the block size, whatever the input length.
+#
+# Usage:
+#     python module2/saeed_module2_1.py 3 4 x          # one value per argument
+#     python module2/saeed_module2_1.py --stream [FILE] # counts for stdin / FILE
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# how many invalid entries are kept as samples (all are counted)
+MAX_INVALID_SAMPLES = 1000
+BLOCK_SIZE = 1 << 24
+
 
 def even_or_odd(n):
     """Return 'even' if integer `n` is even, otherwise 'odd'.
@@ -14,10 +43,217 @@ def even_or_odd(n):
     return "even" if i % 2 == 0 else "odd"
 
 
+@dataclass
+class ParityCounts:
+    even: int = 0
+    odd: int = 0
+    invalid: int = 0
+    # (position, value) of the first MAX_INVALID_SAMPLES invalid entries
+    invalid_samples: List[Tuple[int, object]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.even + self.odd + self.invalid
+
+    def _add_invalid(self, pos: int, value: object) -> None:
+        self.invalid += 1
+        if len(self.invalid_samples) < MAX_INVALID_SAMPLES:
+            self.invalid_samples.append((pos, value))
+
+
+@dataclass
+class ParityResult:
+    # True where the input is even; False for odd and invalid entries
+    is_even: Union["np.ndarray", bytearray]
+    # (position, value) of every entry that is not an integer
+    invalid: List[Tuple[int, object]]
+
+    @property
+    def even_count(self) -> int:
+        return int(np.count_nonzero(self.is_even)) if np is not None else sum(self.is_even)
+
+    @property
+    def odd_count(self) -> int:
+        return len(self.is_even) - self.even_count - len(self.invalid)
+
+    def packed(self) -> bytes:
+        """The even flags as a bit array, 8 entries per byte (MSB first)."""
+        if np is not None:
+            return np.packbits(np.asarray(self.is_even, dtype=bool)).tobytes()
+        out = bytearray((len(self.is_even) + 7) // 8)
+        for i, flag in enumerate(self.is_even):
+            if flag:
+                out[i >> 3] |= 0x80 >> (i & 7)
+        return bytes(out)
+
+
+def _parity(value) -> Optional[int]:
+    """0 for even, 1 for odd, None if `value` is not convertible to int."""
+    if type(value) is int:
+        return value & 1
+    if isinstance(value, (str, bytes)):
+        s = value.strip()
+        digits = s[1:] if s[:1] in ("+", "-", b"+", b"-") else s
+        if digits and digits.isascii() and digits.isdigit():
+            # '0' is 48 (even) in ASCII, so the code keeps the digit's parity
+            last = s[-1]
+            return (last if isinstance(last, int) else ord(last)) & 1
+    try:
+        return int(value) & 1
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _classify_array(arr: "np.ndarray") -> Optional[ParityResult]:
+    arr = arr.ravel()
+    if arr.dtype.kind in "biu":
+        return ParityResult((arr & 1) == 0, [])
+    if arr.dtype.kind == "f":
+        finite = np.isfinite(arr)
+        with np.errstate(invalid="ignore"):
+            is_even = finite & (np.fmod(np.trunc(arr), 2) == 0)
+        bad = np.flatnonzero(~finite)
+        return ParityResult(is_even, [(int(i), arr[i].item()) for i in bad])
+    return None
+
+
+def classify(values) -> ParityResult:
+    """Classify every value of an array or iterable in one pass.
 
+    Integer and float NumPy arrays are handled with array operations;
+    other inputs follow `even_or_odd` conversion rules item by item.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        result = _classify_array(values)
+        if result is not None:
+            return result
+        values = values.ravel().tolist()
+    flags = bytearray()
+    invalid: List[Tuple[int, object]] = []
+    append = flags.append
+    for i, value in enumerate(values):
+        p = _parity(value)
+        if p is None:
+            invalid.append((i, value))
+            append(0)
+        else:
+            append(p ^ 1)
+    if np is not None:
+        return ParityResult(np.frombuffer(bytes(flags), dtype=bool), invalid)
+    return ParityResult(flags, invalid)
+
+
+def count_parity(values: Iterable) -> ParityCounts:
+    """Count even, odd and invalid values without storing per-item results."""
+    counts = ParityCounts()
+    if np is not None and isinstance(values, np.ndarray):
+        result = _classify_array(values)
+        if result is not None:
+            counts.even = result.even_count
+            counts.invalid = len(result.invalid)
+            counts.odd = result.odd_count
+            counts.invalid_samples = result.invalid[:MAX_INVALID_SAMPLES]
+            return counts
+        values = values.flat
+    odd = 0
+    seen = 0
+    for i, value in enumerate(values):
+        seen += 1
+        p = _parity(value)
+        if p is None:
+            counts._add_invalid(i, value)
+        else:
+            odd += p
+    counts.odd = odd
+    counts.even = seen - odd - counts.invalid
+    return counts
+
+
+def _count_lines_slow(lines: List[bytes], first: int, counts: ParityCounts) -> None:
+    for i, line in enumerate(lines, first):
+        # decoded, so int() also accepts non-ASCII digits as it would for str
+        text = line.decode("utf-8", "replace").strip()
+        if not text:
+            continue
+        p = _parity(text)
+        if p is None:
+            counts._add_invalid(i, text)
+        elif p:
+            counts.odd += 1
+        else:
+            counts.even += 1
+
+
+def _count_block(block: bytes, first: int, counts: ParityCounts) -> int:
+    """Count the complete lines of `block`; returns the number of lines."""
+    if np is None:
+        lines = block.split(b"\n")[:-1]
+        _count_lines_slow(lines, first, counts)
+        return len(lines)
+
+    buf = np.frombuffer(block, dtype=np.uint8)
+    ends = np.flatnonzero(buf == 10)
+    n = len(ends)
+    if not n:
+        return 0
+    starts = np.empty(n, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts
+
+    # every line ends with one non-digit ("\n"); a plain line has at most
+    # one more, a leading sign
+    non_digit = np.flatnonzero((buf - np.uint8(48)) > 9)
+    extra = np.bincount(np.searchsorted(ends, non_digit), minlength=n) - 1
+    first_char = buf[np.minimum(starts, len(buf) - 1)]
+    signed = (lengths > 1) & ((first_char == 43) | (first_char == 45))
+    # plain "[+-]digits" lines; everything else (spaces, "\r", "_", junk) is slow
+    plain = (lengths > 0) & (extra == signed)
+    last = buf[np.maximum(ends - 1, 0)]
+    odd_flags = plain & ((last & 1) == 1)
+
+    counts.odd += int(np.count_nonzero(odd_flags))
+    counts.even += int(np.count_nonzero(plain)) - int(np.count_nonzero(odd_flags))
+    for i in np.flatnonzero(~plain).tolist():
+        _count_lines_slow([block[starts[i]:ends[i]]], first + i, counts)
+    return n
+
+
+def count_stream(stream: BinaryIO, block_size: int = BLOCK_SIZE) -> ParityCounts:
+    """Count even/odd/invalid lines of a binary newline-delimited stream.
+
+    Blank lines are skipped. Invalid lines are counted, and the first
+    `MAX_INVALID_SAMPLES` are kept with their 0-based line number.
+    """
+    counts = ParityCounts()
+    line_no = 0
+    tail = b""
+    while True:
+        chunk = stream.read(block_size)
+        if not chunk:
+            break
+        block = tail + chunk
+        cut = block.rfind(b"\n") + 1
+        tail = block[cut:]
+        line_no += _count_block(block[:cut], line_no, counts)
+    if tail:
+        _count_lines_slow([tail], line_no, counts)
+    return counts
+
+
+if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == "--stream":
+        if len(sys.argv) > 2 and sys.argv[2] != "-":
+            with open(sys.argv[2], "rb") as f:
+                result = count_stream(f)
+        else:
+            result = count_stream(sys.stdin.buffer)
+        for line, value in result.invalid_samples:
+            print(f"line {line + 1}: invalid - {value!r}", file=sys.stderr)
+        print(f"even: {result.even}  odd: {result.odd}  invalid: {result.invalid}")
+    elif len(sys.argv) > 1:
         for arg in sys.argv[1:]:
             try:
                 print(f"{arg}: {even_or_odd(arg)}")
@@ -29,5 +265,3 @@ def even_or_odd(n):
             print(even_or_odd(s))
         except Exception as e:
             print("Error:", e)
-            
-
@@ -0,0 +1,216 @@
+"""N x N, k-in-a-row board engine (Tic-Tac-Toe, Gomoku, ...).
+
+Each player's stones are kept in one integer bitmask. The board is stored
+with one extra, always-empty padding column per row, so cell (row, col)
+is bit `row * (n + 1) + col`. With that layout the four line directions
+are fixed bit steps:
+
+- horizontal    : 1
+- vertical      : n + 1
+- diagonal      : n + 2
+- anti-diagonal : n
+
+and a run of stones can never wrap from one row into the next, because
+it would have to cross a padding bit.
+
+A win can only be created by the stone just played, so `play` only counts
+the stones in line with that cell in the 4 directions (at most k - 1 bit
+tests each way). Win checking is O(k) per move regardless of board size,
+and the move counter makes the "board full" check O(1).
+
+Usage:
+    python module2/saeed_module2_10.py play [n] [k]   # two players
+    python module2/saeed_module2_10.py bench          # engine vs full scan
+"""
+import random
+import time
+from typing import List, Optional, Tuple
+
+PLAYERS = ("X", "O")
+
+
+class KInARowBoard:
+    def __init__(self, n: int = 3, k: Optional[int] = None):
+        if k is None:
+            k = n
+        if n < 1 or not 1 <= k <= n:
+            raise ValueError("need n >= 1 and 1 <= k <= n")
+        self.n = n
+        self.k = k
+        self.width = n + 1
+        self.steps = (1, self.width, self.width + 1, self.width - 1)
+        self.bits = [0, 0]
+        self.moves = 0
+        self.history: List[int] = []
+        self.winner: Optional[str] = None
+
+    @property
+    def current(self) -> str:
+        return PLAYERS[self.moves & 1]
+
+    def is_full(self) -> bool:
+        return self.moves == self.n * self.n
+
+    def is_over(self) -> bool:
+        return self.winner is not None or self.is_full()
+
+    def index(self, row: int, col: int) -> int:
+        if not (0 <= row < self.n and 0 <= col < self.n):
+            raise ValueError(f"cell ({row}, {col}) is outside the {self.n}x{self.n} board")
+        return row * self.width + col
+
+    def is_empty(self, row: int, col: int) -> bool:
+        bit = 1 << self.index(row, col)
+        return not (self.bits[0] | self.bits[1]) & bit
+
+    def _run(self, mine: int, pos: int, step: int) -> int:
+        # count own stones from `pos` onward in steps of `step`
+        count = 0
+        while count < self.k and pos >= 0 and (mine >> pos) & 1:
+            count += 1
+            pos += step
+        return count
+
+    def wins_at(self, player: int, pos: int) -> bool:
+        """Does `player` (0 or 1) have k in a row through bit `pos`?"""
+        mine = self.bits[player]
+        for step in self.steps:
+            if 1 + self._run(mine, pos + step, step) + self._run(mine, pos - step, -step) >= self.k:
+                return True
+        return False
+
+    def play(self, row: int, col: int) -> Optional[str]:
+        """Place the current player's stone and return the winner, if any."""
+        if self.is_over():
+            raise ValueError("the game is over")
+        pos = self.index(row, col)
+        bit = 1 << pos
+        if (self.bits[0] | self.bits[1]) & bit:
+            raise ValueError(f"cell ({row}, {col}) is already taken")
+        player = self.moves & 1
+        self.bits[player] |= bit
+        self.moves += 1
+        self.history.append(pos)
+        if self.wins_at(player, pos):
+            self.winner = PLAYERS[player]
+        return self.winner
+
+    def undo(self) -> None:
+        """Take back the last move."""
+        pos = self.history.pop()
+        self.moves -= 1
+        self.bits[self.moves & 1] &= ~(1 << pos)
+        self.winner = None
+
+    def cells(self) -> List[List[str]]:
+        """The board as rows of "X", "O" or ""."""
+        rows = []
+        for r in range(self.n):
+            row = []
+            for c in range(self.n):
+                bit = 1 << (r * self.width + c)
+                row.append("X" if self.bits[0] & bit else "O" if self.bits[1] & bit else "")
+            rows.append(row)
+        return rows
+
+    def display(self) -> None:
+        print("   " + " ".join(f"{c:2}" for c in range(self.n)))
+        for r, row in enumerate(self.cells()):
+            print(f"{r:2} " + " ".join(f"{cell or '.':>2}" for cell in row))
+
+
+def scan_winner(cells: List[List[str]], k: int) -> Optional[str]:
+    """Reference check: look at every k-long window on the board."""
+    n = len(cells)
+    for r in range(n):
+        for c in range(n):
+            first = cells[r][c]
+            if not first:
+                continue
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                if not (0 <= end_r < n and 0 <= end_c < n):
+                    continue
+                if all(cells[r + dr * i][c + dc * i] == first for i in range(k)):
+                    return first
+    return None
+
+
+def _random_games(n: int, k: int, games: int, seed: int) -> List[List[Tuple[int, int]]]:
+    rng = random.Random(seed)
+    all_cells = [(r, c) for r in range(n) for c in range(n)]
+    out = []
+    for _ in range(games):
+        order = all_cells[:]
+        rng.shuffle(order)
+        out.append(order)
+    return out
+
+
+def benchmark(sizes=((3, 3), (15, 5), (19, 5), (50, 5), (100, 5)), games: int = 20,
+              scan_limit: int = 2000) -> List[dict]:
+    """Play random games with the engine and with a full-board scan per move.
+
+    The scan is quadratic in the board size, so it only runs for the first
+    `scan_limit` moves of each size; per-move times are compared.
+    """
+    results = []
+    for n, k in sizes:
+        orders = _random_games(n, k, games, seed=n)
+
+        t0 = time.perf_counter()
+        moves = 0
+        for order in orders:
+            board = KInARowBoard(n, k)
+            for r, c in order:
+                moves += 1
+                if board.play(r, c) or board.is_full():
+                    break
+        engine_us = (time.perf_counter() - t0) / moves * 1e6
+
+        t0 = time.perf_counter()
+        scanned = 0
+        for order in orders:
+            cells = [[""] * n for _ in range(n)]
+            for i, (r, c) in enumerate(order):
+                cells[r][c] = PLAYERS[i & 1]
+                scanned += 1
+                if scan_winner(cells, k) or scanned >= scan_limit:
+                    break
+            if scanned >= scan_limit:
+                break
+        scan_us = (time.perf_counter() - t0) / scanned * 1e6
+
+        results.append({"n": n, "k": k, "engine_us_per_move": round(engine_us, 2),
+                        "scan_us_per_move": round(scan_us, 2),
+                        "speedup": round(scan_us / engine_us, 1)})
+    return results
+
+
+def play(n: int = 15, k: int = 5) -> None:
+    board = KInARowBoard(n, k)
+    while not board.is_over():
+        board.display()
+        raw = input(f"Player {board.current} - enter row and column: ").split()
+        try:
+            board.play(int(raw[0]), int(raw[1]))
+        except (ValueError, IndexError) as e:
+            print("Invalid move:", e)
+    board.display()
+    print(f"Player {board.winner} wins!" if board.winner else "It's a draw.")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        for row in benchmark():
+            print(row)
+    elif len(sys.argv) > 1 and sys.argv[1] == "play":
+        size = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+        in_a_row = int(sys.argv[3]) if len(sys.argv) > 3 else min(5, size)
+        play(size, in_a_row)
+    else:
+        print("Usage:")
+        print("  python module2/saeed_module2_10.py play [n] [k]")
+        print("  python module2/saeed_module2_10.py bench")
@@ -11,6 +11,18 @@ Encryption method (design summary):
   depending on position.
 - Step 4: Output is base64-url-safe encoded string of the transformed bytes.
 
+Bulk engine:
+- The transform of a byte only depends on `pos % len(key)` and `pos % 256`,
+  so the key and offset sequences repeat every `lcm(len(key), 256)` bytes.
+- With NumPy installed, buffers are processed as uint8 arrays against tiled
+  key/offset blocks (uint8 addition wraps like `& 0xFF`).
+- Without NumPy, every position class gets its own precomputed 256-entry
+  substitution table, applied with `bytes.translate` over strided slices of
+  cache-sized blocks.
+- Either way the output is identical to the byte-by-byte reference loop.
+- Batches of messages are packed back to back (no padding) and transformed
+  with a per-byte position array that restarts at 0 on every message.
+
 Notes / security:
 - This is a custom, non-standard cipher intended for learning/demo only.
 - Do NOT use this for real security-sensitive data. Use established
@@ -19,82 +31,549 @@ Notes / security:
 Functions:
 - `custom_encrypt(plaintext: str, key: str) -> str` : returns encrypted base64 string
 - `custom_decrypt(ciphertext_b64: str, key: str) -> str` : returns original plaintext
+- `custom_encrypt_many(plaintexts, key) -> List[str]` : batch version of `custom_encrypt`
+- `custom_decrypt_many(ciphertexts, key) -> List[str]` : batch version of `custom_decrypt`
+- `encrypt_bytes(data, key, workers=1) -> bytes` / `decrypt_bytes(...) -> bytes` :
+  raw transform of any bytes-like object (no base64 step); `workers` > 1
+  splits large inputs across processes writing into shared memory
+- `encrypt_stream(src, dst, key, chunk_size=...)` / `decrypt_stream(...)` :
+  chunked file/pipe versions with memory use bounded by `chunk_size`
+- `benchmark(size_mb: int = 100, key: str = ...) -> dict` : compare engine vs reference loop
+- `benchmark_parallel(size_mb: int = 100, ...) -> dict` : compare worker counts
+- `benchmark_many(count: int = 200_000, ...) -> dict` : batch API vs a loop of single calls
 
 """
 import base64
-from typing import Sequence
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import BinaryIO, Iterable, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # the translate-table engine below needs only the stdlib
+    np = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Position classes with more tables than this fall back to two separate
+# passes (XOR by key, then shift by position) to keep the table cache small.
+_MAX_PERIOD = 8192
+# Each strided slice inside a block covers about this many bytes, which keeps
+# the block cache-resident while the tables are applied.
+_SLICE_LEN = 1024
+# Block size (bytes) for the NumPy path, rounded up to a multiple of the period.
+_NUMPY_BLOCK = 1 << 20
+# Default read size for the streaming functions.
+_STREAM_CHUNK = 1 << 20
+# Inputs smaller than this are not worth starting worker processes for.
+_PARALLEL_MIN = 4 << 20
+# Batches are packed into groups of about this many bytes; longer messages
+# are transformed on their own.
+_PACK_BYTES = 1 << 20
 
 
 def _key_bytes(key: str) -> bytes:
     return key.encode("utf-8") if key is not None else b""
 
 
-def custom_encrypt(plaintext: str, key: str) -> str:
-    """Encrypt `plaintext` with `key` and return a url-safe base64 string.
+def _period(key_len: int) -> int:
+    return key_len * 256 // math.gcd(key_len, 256)
 
-    Method details:
-    - Convert plaintext -> bytes.
-    - Create repeating key bytes from `key`.
-    - For each byte at index `i`: t = ((b ^ k) + i) & 0xFF
-    - Return base64.urlsafe_b64encode(transformed_bytes).decode()
 
-    """
-    if plaintext is None:
-        raise TypeError("plaintext must be a string")
-    if key is None:
-        raise TypeError("key must be a string")
+@lru_cache(maxsize=None)
+def _xor_table(k: int) -> bytes:
+    return bytes(b ^ k for b in range(256))
 
-    data = plaintext.encode("utf-8")
-    kb = _key_bytes(key)
-    if len(kb) == 0:
-        raise ValueError("key must be non-empty")
 
+@lru_cache(maxsize=None)
+def _shift_table(s: int) -> bytes:
+    return bytes((b + s) & 0xFF for b in range(256))
+
+
+@lru_cache(maxsize=16)
+def _position_tables(kb: bytes, decrypt: bool) -> Tuple[bytes, ...]:
+    """Return one substitution table per position class modulo `_period(len(kb))`."""
+    tables = []
+    for j in range(_period(len(kb))):
+        xor = _xor_table(kb[j % len(kb)])
+        if decrypt:
+            tables.append(_shift_table(-j & 0xFF).translate(xor))
+        else:
+            tables.append(xor.translate(_shift_table(j & 0xFF)))
+    return tuple(tables)
+
+
+def _passes(kb: bytes, decrypt: bool) -> List[Tuple[bytes, ...]]:
+    """Return the table sequences to apply, one sequence per pass."""
+    if _period(len(kb)) <= _MAX_PERIOD:
+        return [_position_tables(kb, decrypt)]
+    xors = tuple(_xor_table(k) for k in kb)
+    if decrypt:
+        return [tuple(_shift_table(-j & 0xFF) for j in range(256)), xors]
+    return [xors, tuple(_shift_table(j) for j in range(256))]
+
+
+def _transform_scalar(data: BytesLike, kb: bytes, decrypt: bool, pos: int = 0) -> bytearray:
+    """Reference byte-by-byte implementation of the cipher transform.
+
+    `pos` is the absolute position of `data[0]` in the whole message.
+    """
     out = bytearray(len(data))
-    for i, b in enumerate(data):
+    for i, b in enumerate(data, pos):
         k = kb[i % len(kb)]
-        out[i] = ((b ^ k) + i) & 0xFF
+        if decrypt:
+            # reverse: b = ((t - i) & 0xFF) ^ k
+            out[i - pos] = ((b - i) & 0xFF) ^ k
+        else:
+            out[i - pos] = ((b ^ k) + i) & 0xFF
+    return out
 
-    return base64.urlsafe_b64encode(bytes(out)).decode("ascii")
 
+@lru_cache(maxsize=16)
+def _numpy_tiles(kb: bytes):
+    """Return (key, offset) uint8 tiles one period longer than a NumPy block."""
+    period = _period(len(kb))
+    block_size = -(-_NUMPY_BLOCK // period) * period
+    classes = np.arange(block_size + period)
+    keys = np.frombuffer(kb, dtype=np.uint8)[classes % len(kb)]
+    offsets = (classes % 256).astype(np.uint8)
+    return block_size, keys, offsets
 
-def custom_decrypt(ciphertext_b64: str, key: str) -> str:
-    """Reverse `custom_encrypt` and return the plaintext string.
 
-    Raises ValueError on malformed input or incorrect key.
+def _transform_numpy(src: memoryview, kb: bytes, decrypt: bool, pos: int = 0) -> bytearray:
+    block_size, keys, offsets = _numpy_tiles(kb)
+    phase = pos % _period(len(kb))
+
+    arr = np.frombuffer(src, dtype=np.uint8)
+    out = bytearray(len(src))
+    res = np.frombuffer(out, dtype=np.uint8)
+    for start in range(0, len(arr), block_size):
+        a = arr[start:start + block_size]
+        r = res[start:start + block_size]
+        k = keys[phase:phase + len(a)]
+        o = offsets[phase:phase + len(a)]
+        if decrypt:
+            np.subtract(a, o, out=r)
+            np.bitwise_xor(r, k, out=r)
+        else:
+            np.bitwise_xor(a, k, out=r)
+            np.add(r, o, out=r)
+    return out
+
+
+def _transform(data: BytesLike, kb: bytes, decrypt: bool = False, pos: int = 0) -> bytearray:
+    """Apply the cipher transform to a whole buffer.
+
+    `data` can be any bytes-like object; it is read through a memoryview one
+    block at a time, so the input is never copied as a whole. `pos` is the
+    absolute position of `data[0]`, which lets callers transform a message
+    piece by piece.
     """
-    if ciphertext_b64 is None:
-        raise TypeError("ciphertext_b64 must be a string")
+    src = memoryview(data).cast("B")
+    n = len(src)
+    if n < 4 * _period(len(kb)):
+        return _transform_scalar(src, kb, decrypt, pos)
+    if np is not None:
+        return _transform_numpy(src, kb, decrypt, pos)
+
+    passes = _passes(kb, decrypt)
+    widest = max(len(tables) for tables in passes)
+    block_size = widest * _SLICE_LEN
+    out = bytearray(n)
+    for start in range(0, n, block_size):
+        block = bytearray(src[start:start + block_size])
+        for tables in passes:
+            m = len(tables)
+            for j in range(min(m, len(block))):
+                block[j::m] = block[j::m].translate(tables[(pos + start + j) % m])
+        out[start:start + len(block)] = block
+    return out
+
+
+def _require_key(key: str) -> bytes:
     if key is None:
         raise TypeError("key must be a string")
+    kb = _key_bytes(key)
+    if len(kb) == 0:
+        raise ValueError("key must be non-empty")
+    return kb
 
+
+def _as_bytes(plaintext: Union[str, BytesLike]) -> BytesLike:
+    if plaintext is None:
+        raise TypeError("plaintext must be a string")
+    if isinstance(plaintext, str):
+        return plaintext.encode("utf-8")
+    return plaintext
+
+
+def _b64decode(ciphertext_b64: Union[str, bytes]) -> bytes:
+    if ciphertext_b64 is None:
+        raise TypeError("ciphertext_b64 must be a string")
     try:
-        data = base64.urlsafe_b64decode(ciphertext_b64.encode("ascii"))
+        if isinstance(ciphertext_b64, str):
+            ciphertext_b64 = ciphertext_b64.encode("ascii")
+        return base64.urlsafe_b64decode(ciphertext_b64)
     except Exception as e:
         raise ValueError("ciphertext is not valid base64") from e
 
-    kb = _key_bytes(key)
-    if len(kb) == 0:
-        raise ValueError("key must be non-empty")
-
-    out = bytearray(len(data))
-    for i, t in enumerate(data):
-        k = kb[i % len(kb)]
-        # reverse: b = ((t - i) & 0xFF) ^ k
-        b = ((t - i) & 0xFF) ^ k
-        out[i] = b
 
+def _utf8(out: BytesLike) -> str:
     try:
-        return out.decode("utf-8")
+        return bytes(out).decode("utf-8")
     except Exception as e:
         raise ValueError("decrypted bytes are not valid UTF-8") from e
 
 
+def _transform_packed(chunks: Sequence[BytesLike], kb: bytes, decrypt: bool) -> List[bytes]:
+    """NumPy transform of messages packed back to back into one buffer.
+
+    Each byte gets its position inside its own message, so the key and
+    offset sequences restart at every message boundary.
+    """
+    lengths = np.fromiter((len(c) for c in chunks), dtype=np.int64, count=len(chunks))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    arr = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+    pos = np.arange(len(arr), dtype=np.int64) - np.repeat(starts, lengths)
+    keys = np.frombuffer(kb, dtype=np.uint8)[pos % len(kb)]
+    offsets = pos.astype(np.uint8)  # wraps like & 0xFF
+    if decrypt:
+        res = np.bitwise_xor(arr - offsets, keys)
+    else:
+        res = np.bitwise_xor(arr, keys) + offsets
+    out = res.tobytes()
+    return [out[a:b] for a, b in zip(starts.tolist(), ends.tolist())]
+
+
+def _transform_many(chunks: Sequence[BytesLike], kb: bytes, decrypt: bool) -> List[bytes]:
+    """Transform several independent messages, each starting at position 0.
+
+    With NumPy, short messages are packed back to back in groups of about
+    `_PACK_BYTES` and each group goes through `_transform_packed`; messages
+    of `_PACK_BYTES` and more (and everything without NumPy) go through
+    `_transform` one at a time.
+    """
+    if np is None:
+        return [bytes(_transform(c, kb, decrypt)) for c in chunks]
+
+    results: List[bytes] = []
+    group: List[BytesLike] = []
+    group_bytes = 0
+    for c in chunks:
+        if len(c) >= _PACK_BYTES:
+            if group:
+                results.extend(_transform_packed(group, kb, decrypt))
+                group, group_bytes = [], 0
+            results.append(bytes(_transform(c, kb, decrypt)))
+            continue
+        group.append(c)
+        group_bytes += len(c)
+        if group_bytes >= _PACK_BYTES:
+            results.extend(_transform_packed(group, kb, decrypt))
+            group, group_bytes = [], 0
+    if group:
+        results.extend(_transform_packed(group, kb, decrypt))
+    return results
+
+
+def _transform_segment(in_name: str, out_name: str, start: int, end: int,
+                       kb: bytes, decrypt: bool) -> None:
+    """Worker: transform bytes `[start, end)` of one shared buffer into another."""
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        src = shm_in.buf[start:end]
+        shm_out.buf[start:end] = _transform(src, kb, decrypt, pos=start)
+        src.release()
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+
+def _transform_parallel(data: BytesLike, kb: bytes, decrypt: bool, workers: int) -> bytes:
+    """Split `data` into one segment per worker and transform them in parallel.
+
+    Each byte's transform depends only on its absolute position and the key,
+    so every worker handles its segment independently, starting from the
+    segment's offset, and writes straight into one shared output buffer.
+    """
+    src = memoryview(data).cast("B")
+    n = len(src)
+    shm_in = shared_memory.SharedMemory(create=True, size=n)
+    shm_out = shared_memory.SharedMemory(create=True, size=n)
+    try:
+        shm_in.buf[:n] = src
+        bounds = [n * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_transform_segment, shm_in.name, shm_out.name, a, b, kb, decrypt)
+                for a, b in zip(bounds, bounds[1:])
+            ]
+            for f in futures:
+                f.result()
+        return bytes(shm_out.buf[:n])
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+
+
+def _run(data: BytesLike, kb: bytes, decrypt: bool, workers: int | None) -> bytes:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and memoryview(data).nbytes >= _PARALLEL_MIN:
+        return _transform_parallel(data, kb, decrypt, workers)
+    return bytes(_transform(data, kb, decrypt))
+
+
+def encrypt_bytes(data: BytesLike, key: str, workers: int | None = 1) -> bytes:
+    """Encrypt a bytes-like object with `key` and return the raw cipher bytes.
+
+    With `workers` > 1 (or None for one per CPU), inputs of a few MB and up
+    are split across that many processes sharing one output buffer.
+    """
+    kb = _require_key(key)
+    return _run(data, kb, False, workers)
+
+
+def decrypt_bytes(data: BytesLike, key: str, workers: int | None = 1) -> bytes:
+    """Reverse `encrypt_bytes` and return the raw plain bytes."""
+    kb = _require_key(key)
+    return _run(data, kb, True, workers)
+
+
+def custom_encrypt(plaintext: Union[str, BytesLike], key: str) -> str:
+    """Encrypt `plaintext` with `key` and return a url-safe base64 string.
+
+    Method details:
+    - Convert plaintext -> bytes (bytes-like input is used as is).
+    - Create repeating key bytes from `key`.
+    - For each byte at index `i`: t = ((b ^ k) + i) & 0xFF
+    - Return base64.urlsafe_b64encode(transformed_bytes).decode()
+
+    """
+    data = _as_bytes(plaintext)
+    kb = _require_key(key)
+    return base64.urlsafe_b64encode(_transform(data, kb)).decode("ascii")
+
+
+def custom_decrypt(ciphertext_b64: str, key: str) -> str:
+    """Reverse `custom_encrypt` and return the plaintext string.
+
+    Raises ValueError on malformed input or incorrect key.
+    """
+    data = _b64decode(ciphertext_b64)
+    kb = _require_key(key)
+    return _utf8(_transform(data, kb, decrypt=True))
+
+
+def custom_encrypt_many(plaintexts: Iterable[Union[str, BytesLike]], key: str) -> List[str]:
+    """Encrypt every item of `plaintexts` with `key`.
+
+    Returns the same strings `custom_encrypt` would return for each item.
+    """
+    kb = _require_key(key)
+    chunks = [_as_bytes(p) for p in plaintexts]
+    return [
+        base64.urlsafe_b64encode(c).decode("ascii")
+        for c in _transform_many(chunks, kb, decrypt=False)
+    ]
+
+
+def custom_decrypt_many(ciphertexts: Iterable[str], key: str) -> List[str]:
+    """Decrypt every item of `ciphertexts` with `key`.
+
+    Raises ValueError if any item is malformed, like `custom_decrypt`.
+    """
+    kb = _require_key(key)
+    chunks = [_b64decode(c) for c in ciphertexts]
+    return [_utf8(c) for c in _transform_many(chunks, kb, decrypt=True)]
+
+
+def encrypt_stream(src: BinaryIO, dst: BinaryIO, key: str, chunk_size: int = _STREAM_CHUNK) -> int:
+    """Encrypt bytes read from `src` and write the base64 text to `dst`.
+
+    `src` is read `chunk_size` bytes at a time and the byte position is
+    carried from one chunk to the next, so `dst` receives exactly the string
+    `custom_encrypt` would return for the whole input. Memory use depends on
+    `chunk_size` only. Returns the number of plain bytes read.
+    """
+    kb = _require_key(key)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    # a multiple of 3 bytes encodes to base64 without padding
+    chunk_size = -(-chunk_size // 3) * 3
+
+    pos = 0
+    pending = b""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        data = pending + _transform(chunk, kb, pos=pos)
+        pos += len(chunk)
+        cut = len(data) - len(data) % 3
+        dst.write(base64.urlsafe_b64encode(data[:cut]))
+        pending = data[cut:]
+    dst.write(base64.urlsafe_b64encode(pending))
+    return pos
+
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO, key: str, chunk_size: int = _STREAM_CHUNK) -> int:
+    """Reverse `encrypt_stream`: read base64 text from `src`, write plain bytes to `dst`.
+
+    Whitespace in the input (such as a trailing newline) is ignored. The
+    plain bytes are written as they are, without the UTF-8 check done by
+    `custom_decrypt`. Raises ValueError on malformed base64.
+    Returns the number of plain bytes written.
+    """
+    kb = _require_key(key)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    pos = 0
+    pending = b""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        data = pending + chunk.translate(None, b" \t\r\n")
+        cut = len(data) - len(data) % 4
+        plain = _transform(_b64decode(data[:cut]), kb, decrypt=True, pos=pos)
+        dst.write(plain)
+        pos += len(plain)
+        pending = data[cut:]
+    if pending:
+        # only reached for truncated input, which the decoder rejects
+        _b64decode(pending)
+    return pos
+
+
+def benchmark(size_mb: int = 100, key: str = "benchmark-key", reference_mb: int = 4) -> dict:
+    """Time the bulk engine against the byte-by-byte reference loop.
+
+    The engine runs over `size_mb` MB of random data. The reference loop is
+    linear, so it is timed on `reference_mb` MB and its throughput is used
+    to estimate the full-size time.
+    """
+    kb = _require_key(key)
+    data = os.urandom(size_mb * 1024 * 1024)
+    sample = memoryview(data)[: reference_mb * 1024 * 1024]
+
+    t0 = time.perf_counter()
+    expected = _transform_scalar(sample, kb, decrypt=False)
+    t_ref = (time.perf_counter() - t0) * len(data) / len(sample)
+
+    t0 = time.perf_counter()
+    out = _transform(data, kb)
+    t_bulk = time.perf_counter() - t0
+
+    if out[: len(sample)] != expected:
+        raise AssertionError("bulk engine output differs from the reference loop")
+    return {
+        "engine": "numpy" if np is not None else "translate",
+        "size_mb": size_mb,
+        "reference_s": round(t_ref, 3),
+        "bulk_s": round(t_bulk, 3),
+        "speedup": round(t_ref / t_bulk, 1),
+    }
+
+
+def benchmark_parallel(size_mb: int = 100, key: str = "benchmark-key",
+                       worker_counts: Sequence[int] = (1, 2, 4, 8)) -> dict:
+    """Time `encrypt_bytes` on `size_mb` MB of random data for each worker count.
+
+    `workers=1` is the serial path. Speedups are relative to it.
+    """
+    data = os.urandom(size_mb * 1024 * 1024)
+    expected = None
+    timings = {}
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        out = encrypt_bytes(data, key, workers=workers)
+        timings[workers] = time.perf_counter() - t0
+        if expected is None:
+            expected = out
+        elif out != expected:
+            raise AssertionError(f"parallel output with {workers} workers differs")
+    serial = timings[worker_counts[0]]
+    return {
+        "size_mb": size_mb,
+        "cpus": os.cpu_count(),
+        "seconds": {w: round(t, 3) for w, t in timings.items()},
+        "speedup": {w: round(serial / t, 2) for w, t in timings.items()},
+    }
+
+
+def benchmark_many(count: int = 200_000, key: str = "secret", message_len: int = 15) -> dict:
+    """Time `custom_encrypt_many` against a loop of `custom_encrypt` calls.
+
+    Uses `count` random ASCII messages of about `message_len` characters.
+    Raises AssertionError if the outputs differ or the batch call is slower
+    than the loop.
+    """
+    import random
+
+    rng = random.Random(0)
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789 "
+    messages = ["".join(rng.choices(alphabet, k=rng.randint(1, 2 * message_len)))
+                for _ in range(count)]
+
+    t0 = time.perf_counter()
+    expected = [custom_encrypt(m, key) for m in messages]
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    out = custom_encrypt_many(messages, key)
+    t_batch = time.perf_counter() - t0
+
+    if out != expected:
+        raise AssertionError("custom_encrypt_many output differs from custom_encrypt")
+    if t_batch > t_loop:
+        raise AssertionError(f"batch call ({t_batch:.3f}s) slower than the loop ({t_loop:.3f}s)")
+    return {
+        "messages": count,
+        "loop_s": round(t_loop, 3),
+        "batch_s": round(t_batch, 3),
+        "speedup": round(t_loop / t_batch, 1),
+    }
+
+
+if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) >= 4 and sys.argv[1] in ("enc", "dec"):
-        mode = sys.argv[1]
-        key = sys.argv[2]
-        rest = " ".join(sys.argv[3:])
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] in ("enc", "dec") and (len(args) == 2 or args[2] == "-f"):
+        # stream a file (or stdin when the path is "-" or missing) to a file or stdout
+        mode, key = args[0], args[1]
+        src_path = args[3] if len(args) > 3 else "-"
+        dst_path = args[4] if len(args) > 4 else "-"
+        src = sys.stdin.buffer if src_path == "-" else open(src_path, "rb")
+        dst = sys.stdout.buffer if dst_path == "-" else open(dst_path, "wb")
+        try:
+            if mode == "enc":
+                encrypt_stream(src, dst, key)
+                if dst_path == "-":
+                    dst.write(b"\n")
+            else:
+                decrypt_stream(src, dst, key)
+        except Exception as e:
+            print("Error:", e, file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if src is not sys.stdin.buffer:
+                src.close()
+            if dst is not sys.stdout.buffer:
+                dst.close()
+    elif len(args) >= 3 and args[0] in ("enc", "dec"):
+        mode = args[0]
+        key = args[1]
+        rest = " ".join(args[2:])
         if mode == "enc":
             print(custom_encrypt(rest, key))
         else:
@@ -102,7 +581,22 @@ def custom_decrypt(ciphertext_b64: str, key: str) -> str:
                 print(custom_decrypt(rest, key))
             except Exception as e:
                 print("Error:", e)
+    elif len(args) >= 1 and args[0] == "bench":
+        size = int(args[1]) if len(args) > 1 else 100
+        print(benchmark(size))
+    elif len(args) >= 1 and args[0] == "bench-parallel":
+        size = int(args[1]) if len(args) > 1 else 100
+        print(benchmark_parallel(size))
+    elif len(args) >= 1 and args[0] == "bench-many":
+        count = int(args[1]) if len(args) > 1 else 200_000
+        print(benchmark_many(count))
+        print(benchmark_many(count, key="k"))
     else:
         print("Usage:")
         print("  python module2/saeed_module2_2.py enc <key> <text to encrypt>")
         print("  python module2/saeed_module2_2.py dec <key> <base64-cipher>")
+        print("  python module2/saeed_module2_2.py enc <key> [-f <input|-> [<output>]]")
+        print("  python module2/saeed_module2_2.py dec <key> [-f <input|-> [<output>]]")
+        print("  python module2/saeed_module2_2.py bench [size-in-MB]")
+        print("  python module2/saeed_module2_2.py bench-parallel [size-in-MB]")
+        print("  python module2/saeed_module2_2.py bench-many [messages]")
@@ -1,9 +1,37 @@
 """Utilities for list operations.
 
 Provides `unique_numbers` which returns unique items from a list
-while preserving the original order.
+while preserving the original order, plus variants for data that is too
+large for a single in-memory set:
+
+- `iter_unique`: lazy generator, yields each value the first time it is seen;
+- `unique_array`: NumPy fast path (`np.unique` with `return_index`);
+- `iter_unique_external`: out-of-core mode. Values are spilled to hashed
+  partition files on disk, each partition is deduplicated on its own and
+  the partitions are merged back by first-seen position, so memory holds
+  one partition at a time;
+- `BloomFilter` / `iter_unique_approx` and `HyperLogLog` / `approx_distinct`:
+  approximate dedup and distinct counts in fixed memory.
+
+Usage:
+    python module2/saeed_module2_3.py 1 2 2 3 1
+    python module2/saeed_module2_3.py bench
 """
-from typing import Iterable, List
+import heapq
+import math
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_MASK64 = (1 << 64) - 1
 
 
 def unique_numbers(numbers: Iterable[float]) -> List[float]:
@@ -14,7 +42,10 @@ def unique_numbers(numbers: Iterable[float]) -> List[float]:
         [1, 2, 3]
 
     The function treats values using normal equality/hash semantics for numbers.
+    NumPy arrays go through `unique_array`.
     """
+    if np is not None and isinstance(numbers, np.ndarray):
+        return unique_array(numbers).tolist()
     seen = set()
     out: List[float] = []
     for x in numbers:
@@ -24,11 +55,252 @@ def unique_numbers(numbers: Iterable[float]) -> List[float]:
     return out
 
 
+def iter_unique(numbers: Iterable[float]) -> Iterator[float]:
+    """Yield each number the first time it appears."""
+    seen = set()
+    add = seen.add
+    for x in numbers:
+        if x not in seen:
+            add(x)
+            yield x
+
+
+def unique_array(arr: "np.ndarray") -> "np.ndarray":
+    """Unique values of a 1-D array in first-seen order.
+
+    `np.unique` sorts; `return_index` gives the first position of every
+    value, and sorting those positions restores the input order.
+    """
+    arr = np.asarray(arr).ravel()
+    _, first = np.unique(arr, return_index=True)
+    first.sort()
+    return arr[first]
+
+
+# --- external-memory mode -------------------------------------------------
+
+def _write_batches(path: str, records: Iterable[Tuple[int, Any]], batch_size: int) -> None:
+    with open(path, "ab") as f:
+        batch = []
+        for rec in records:
+            batch.append(rec)
+            if len(batch) >= batch_size:
+                pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+                batch = []
+        if batch:
+            pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+
+
+def _read_batches(path: str) -> Iterator[Tuple[int, Any]]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def iter_unique_external(numbers: Iterable[float], partitions: int = 64,
+                         buffer_size: int = 65_536, tmpdir: Optional[str] = None
+                         ) -> Iterator[float]:
+    """Dedupe a stream larger than memory, preserving first-seen order.
+
+    1. Every value is tagged with its position and appended to partition
+       file `hash(value) % partitions`; equal values (including 1 and 1.0)
+       always land in the same partition.
+    2. Each partition is deduplicated with an in-memory dict and its first
+       occurrences are written back sorted by position.
+    3. The sorted partitions are merged by position with `heapq.merge`.
+
+    Peak memory is about one partition's distinct values plus one write
+    buffer per partition. Temporary files are removed when the generator
+    finishes or is closed.
+    """
+    workdir = tempfile.mkdtemp(prefix="unique_", dir=tmpdir)
+    try:
+        spill = [os.path.join(workdir, f"part{i}.bin") for i in range(partitions)]
+        buffers: List[List[Tuple[int, Any]]] = [[] for _ in range(partitions)]
+        for pos, x in enumerate(numbers):
+            buf = buffers[hash(x) % partitions]
+            buf.append((pos, x))
+            if len(buf) >= buffer_size:
+                _write_batches(spill[hash(x) % partitions], buf, buffer_size)
+                buf.clear()
+        for path, buf in zip(spill, buffers):
+            _write_batches(path, buf, buffer_size)
+        del buffers
+
+        firsts = []
+        for i, path in enumerate(spill):
+            seen: Dict[Any, int] = {}
+            for pos, x in _read_batches(path):
+                if x not in seen:
+                    seen[x] = pos
+            os.remove(path)
+            out = os.path.join(workdir, f"first{i}.bin")
+            _write_batches(out, sorted((pos, x) for x, pos in seen.items()), buffer_size)
+            firsts.append(out)
+
+        for _, x in heapq.merge(*(_read_batches(p) for p in firsts), key=lambda r: r[0]):
+            yield x
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# --- approximate mode -----------------------------------------------------
+
+def _mix64(h: int) -> int:
+    """splitmix64 finalizer: spreads a (possibly small) hash over 64 bits."""
+    h = (h + 0x9E3779B97F4A7C15) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+
+class BloomFilter:
+    """Set membership with no false negatives and about `error_rate` false positives."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, x: Any) -> Iterator[int]:
+        h1 = _mix64(hash(x) & _MASK64)
+        h2 = _mix64(h1) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, x: Any) -> bool:
+        """Add `x`; returns True if it was (probably) already present."""
+        present = True
+        bits = self.bits
+        for p in self._positions(x):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                present = False
+                bits[p >> 3] |= mask
+        return present
+
+    def __contains__(self, x: Any) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(x))
+
+
+def iter_unique_approx(numbers: Iterable[float], capacity: int,
+                       error_rate: float = 0.01) -> Iterator[float]:
+    """Like `iter_unique` in fixed memory; may drop about `error_rate` of the unique values."""
+    bloom = BloomFilter(capacity, error_rate)
+    for x in numbers:
+        if not bloom.add(x):
+            yield x
+
+
+class HyperLogLog:
+    """Distinct-count estimator with 2**p registers (standard error ~1.04 / sqrt(2**p))."""
+
+    def __init__(self, p: int = 14):
+        if not 4 <= p <= 18:
+            raise ValueError("p must be between 4 and 18")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, x: Any) -> None:
+        h = _mix64(hash(x) & _MASK64)
+        idx = h >> (64 - self.p)
+        rest = (h << self.p) & _MASK64
+        rank = 64 - rest.bit_length() + 1 if rest else 64 - self.p + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def update(self, values: Iterable[Any]) -> None:
+        """Add many values; NumPy numeric arrays are hashed in bulk.
+
+        The array path hashes the 64-bit float value, so it agrees with
+        itself but not with `add`; don't mix both on one estimator.
+        """
+        if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+            self._update_array(values)
+            return
+        for x in values:
+            self.add(x)
+
+    def _update_array(self, values: "np.ndarray") -> None:
+        # + 0.0 maps -0.0 onto 0.0
+        h = (np.asarray(values, dtype=np.float64).ravel() + 0.0).view(np.uint64)
+        with np.errstate(over="ignore"):
+            h = h + np.uint64(0x9E3779B97F4A7C15)
+            h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            h = h ^ (h >> np.uint64(31))
+        idx = (h >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = h << np.uint64(self.p)
+        # bit length via frexp; the shift keeps the float conversion exact
+        high = rest >> np.uint64(11)
+        bit_length = np.where(high > 0, np.frexp(high.astype(np.float64))[1] + 11,
+                              np.frexp(rest.astype(np.float64))[1])
+        rank = np.where(rest > 0, 65 - bit_length, 64 - self.p + 1).astype(np.uint8)
+        regs = np.frombuffer(self.registers, dtype=np.uint8)
+        np.maximum.at(regs, idx, rank)
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def approx_distinct(numbers: Iterable[float], p: int = 14) -> int:
+    """Approximate number of distinct values, in 2**p bytes of memory."""
+    hll = HyperLogLog(p)
+    hll.update(numbers)
+    return hll.count()
+
+
+def benchmark(sizes=(10_000, 100_000, 1_000_000), distinct_ratio: float = 0.1,
+              seed: int = 0) -> List[dict]:
+    """Time every mode on random integers with `distinct_ratio * n` distinct values."""
+    import random
+
+    results = []
+    for n in sizes:
+        rng = random.Random(seed)
+        data = [rng.randrange(max(1, int(n * distinct_ratio))) for _ in range(n)]
+        expected = unique_numbers(data)
+        row: Dict[str, Any] = {"n": n, "distinct": len(expected)}
+
+        def timed(name, fn):
+            t0 = time.perf_counter()
+            out = fn()
+            row[name + "_s"] = round(time.perf_counter() - t0, 4)
+            return out
+
+        timed("set", lambda: unique_numbers(data))
+        timed("generator", lambda: sum(1 for _ in iter_unique(data)))
+        assert timed("external", lambda: list(iter_unique_external(data))) == expected
+        kept = timed("bloom", lambda: sum(1 for _ in iter_unique_approx(data, len(expected))))
+        row["bloom_kept"] = kept
+        row["hll_estimate"] = timed("hll", lambda: approx_distinct(data))
+        if np is not None:
+            arr = np.array(data)
+            assert timed("numpy", lambda: unique_array(arr)).tolist() == expected
+            row["hll_numpy_estimate"] = timed("hll_numpy", lambda: approx_distinct(arr))
+        results.append(row)
+    return results
+
 
+if __name__ == "__main__":
     # simple CLI: pass numbers separated by spaces
     import sys
 
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        for row in benchmark():
+            print(row)
+    elif len(sys.argv) > 1:
         try:
             nums = [float(a) for a in sys.argv[1:]]
         except ValueError:
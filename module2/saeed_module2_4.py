@@ -5,12 +5,34 @@ Usage:
 
 This will create a `people.json` file next to this module containing
 5 randomly generated people with fields: name, number, location, job_title.
+
+For load-test fixtures with millions of rows:
+
+- `iter_people_chunks(n, chunk_size, seed)` samples every field of a chunk
+  at once (a seeded `numpy.random.Generator` when NumPy is installed,
+  `random.Random` otherwise) and yields lists of `Person`;
+- `write_people(path, n, fmt="jsonl" | "json")` writes JSON Lines or one
+  compact JSON array chunk by chunk, so memory stays constant;
+- `write_people_parallel(...)` splits the rows over worker processes, each
+  with an independent child seed, and concatenates their part files.
+
+    python module2/saeed_module2_4.py bulk people.jsonl 10000000 [jsonl|json] [processes]
 """
 from dataclasses import dataclass, asdict
 import json
+import multiprocessing
 import os
 import random
-from typing import List
+import shutil
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 100_000
+FORMATS = ("jsonl", "json")
 
 
 @dataclass
@@ -21,41 +43,44 @@ class Person:
     job_title: str
 
 
+NAMES = [
+    "Alice",
+    "Bob",
+    "Charlie",
+    "Diana",
+    "Eve",
+    "Frank",
+    "Grace",
+    "Hank",
+    "Ivy",
+    "Jack",
+]
+LOCATIONS = ["New York", "London", "Paris", "Berlin", "Tokyo", "Sydney"]
+JOBS = [
+    "Software Engineer",
+    "Data Analyst",
+    "Product Manager",
+    "Designer",
+    "QA Engineer",
+    "System Administrator",
+]
+PHONE_LOW = 200_000_0000
+PHONE_HIGH = 999_999_9999
+
+
 def _sample_phone() -> str:
     # generate a simple 10-digit phone number string
-    return f"+1{random.randint(200_000_0000, 999_999_9999)}"
+    return f"+1{random.randint(PHONE_LOW, PHONE_HIGH)}"
 
 
 def generate_random_people(n: int = 5) -> List[Person]:
-    names = [
-        "Alice",
-        "Bob",
-        "Charlie",
-        "Diana",
-        "Eve",
-        "Frank",
-        "Grace",
-        "Hank",
-        "Ivy",
-        "Jack",
-    ]
-    locations = ["New York", "London", "Paris", "Berlin", "Tokyo", "Sydney"]
-    jobs = [
-        "Software Engineer",
-        "Data Analyst",
-        "Product Manager",
-        "Designer",
-        "QA Engineer",
-        "System Administrator",
-    ]
-
     people: List[Person] = []
     for _ in range(n):
         person = Person(
-            name=random.choice(names),
+            name=random.choice(NAMES),
             number=_sample_phone(),
-            location=random.choice(locations),
-            job_title=random.choice(jobs),
+            location=random.choice(LOCATIONS),
+            job_title=random.choice(JOBS),
         )
         people.append(person)
     return people
@@ -76,7 +101,149 @@ def save_people_json(people: List[Person], path: str | None = None) -> str:
     return path
 
 
+# JSON-encoded field values, so a record is built by joining strings
+_NAMES_JSON = [json.dumps(v, ensure_ascii=False) for v in NAMES]
+_LOCATIONS_JSON = [json.dumps(v, ensure_ascii=False) for v in LOCATIONS]
+_JOBS_JSON = [json.dumps(v, ensure_ascii=False) for v in JOBS]
+
+
+def _make_rng(seed):
+    if np is not None:
+        return np.random.default_rng(seed)
+    return random.Random(seed)
+
+
+def _sample_columns(rng, k: int) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Indices into NAMES/LOCATIONS/JOBS and phone numbers for `k` people."""
+    if np is not None:
+        return (rng.integers(len(NAMES), size=k).tolist(),
+                rng.integers(PHONE_LOW, PHONE_HIGH + 1, size=k).tolist(),
+                rng.integers(len(LOCATIONS), size=k).tolist(),
+                rng.integers(len(JOBS), size=k).tolist())
+    return (rng.choices(range(len(NAMES)), k=k),
+            [rng.randint(PHONE_LOW, PHONE_HIGH) for _ in range(k)],
+            rng.choices(range(len(LOCATIONS)), k=k),
+            rng.choices(range(len(JOBS)), k=k))
+
+
+def _chunk_sizes(n: int, chunk_size: int) -> Iterator[int]:
+    for start in range(0, n, chunk_size):
+        yield min(chunk_size, n - start)
+
+
+def iter_people_chunks(n: int, chunk_size: int = CHUNK_SIZE,
+                       seed=None) -> Iterator[List[Person]]:
+    """Yield `n` random people in lists of at most `chunk_size`."""
+    rng = _make_rng(seed)
+    for k in _chunk_sizes(n, chunk_size):
+        names, phones, locations, jobs = _sample_columns(rng, k)
+        yield [Person(NAMES[a], f"+1{b}", LOCATIONS[c], JOBS[d])
+               for a, b, c, d in zip(names, phones, locations, jobs)]
+
+
+def _record_chunks(n: int, chunk_size: int, seed) -> Iterator[List[str]]:
+    # same sampling as iter_people_chunks, formatted straight to compact JSON
+    rng = _make_rng(seed)
+    for k in _chunk_sizes(n, chunk_size):
+        names, phones, locations, jobs = _sample_columns(rng, k)
+        yield [f'{{"name":{_NAMES_JSON[a]},"number":"+1{b}",'
+               f'"location":{_LOCATIONS_JSON[c]},"job_title":{_JOBS_JSON[d]}}}'
+               for a, b, c, d in zip(names, phones, locations, jobs)]
+
+
+def _write_records(f, n: int, fmt: str, chunk_size: int, seed, first: bool = True) -> None:
+    # json: records separated by ",", without the surrounding brackets
+    sep = "\n" if fmt == "jsonl" else ","
+    for records in _record_chunks(n, chunk_size, seed):
+        if fmt == "json" and not first:
+            f.write(",")
+        f.write(sep.join(records))
+        if fmt == "jsonl":
+            f.write("\n")
+        first = False
+
+
+def write_people(path: str, n: int, fmt: str = "jsonl", chunk_size: int = CHUNK_SIZE,
+                 seed=None) -> str:
+    """Write `n` random people to `path` as JSON Lines or a compact JSON array."""
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}")
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            f.write("[")
+        _write_records(f, n, fmt, chunk_size, seed)
+        if fmt == "json":
+            f.write("]")
+    return path
+
+
+def _write_part(args) -> str:
+    path, n, fmt, chunk_size, seed = args
+    with open(path, "w", encoding="utf-8") as f:
+        _write_records(f, n, fmt, chunk_size, seed)
+    return path
+
+
+def write_people_parallel(path: str, n: int, fmt: str = "jsonl", processes: Optional[int] = None,
+                          chunk_size: int = CHUNK_SIZE, seed: Optional[int] = None) -> str:
+    """Like `write_people`, with the rows split over a process pool.
+
+    Part `i` is seeded with child `i` of `SeedSequence(seed)` (or the string
+    `"{seed}-{i}"` without NumPy), so the parts are independent and the file
+    is reproducible for a given `seed` and process count. With `seed=None`
+    the base seed comes from the OS, so every run differs.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}")
+    parts = processes or os.cpu_count() or 1
+    if np is not None:
+        seeds = np.random.SeedSequence(seed).spawn(parts)
+    else:
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        seeds = [f"{seed}-{i}" for i in range(parts)]
+    sizes = [n // parts + (i < n % parts) for i in range(parts)]
+    jobs = [(f"{path}.part{i}", size, fmt, chunk_size, s)
+            for i, (size, s) in enumerate(zip(sizes, seeds))]
+
+    with multiprocessing.Pool(parts) as pool:
+        part_paths = pool.map(_write_part, jobs)
+
+    with open(path, "w", encoding="utf-8") as out:
+        if fmt == "json":
+            out.write("[")
+        written = False
+        for part_path, size in zip(part_paths, sizes):
+            if size:
+                if fmt == "json" and written:
+                    out.write(",")
+                with open(part_path, encoding="utf-8") as part:
+                    shutil.copyfileobj(part, out, 1 << 20)
+                written = True
+            os.remove(part_path)
+        if fmt == "json":
+            out.write("]")
+    return path
+
 
-    people = generate_random_people(5)
-    out_path = save_people_json(people)
-    print(f"Wrote {len(people)} people to {out_path}")
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bulk":
+        out_path = sys.argv[2] if len(sys.argv) > 2 else "people.jsonl"
+        count = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000_000
+        fmt = sys.argv[4] if len(sys.argv) > 4 else "jsonl"
+        procs = int(sys.argv[5]) if len(sys.argv) > 5 else 1
+        t0 = time.perf_counter()
+        if procs > 1:
+            write_people_parallel(out_path, count, fmt, processes=procs, seed=0)
+        else:
+            write_people(out_path, count, fmt, seed=0)
+        elapsed = time.perf_counter() - t0
+        print(f"Wrote {count} people to {out_path} in {elapsed:.2f}s "
+              f"({count / elapsed:,.0f} rows/s)")
+    else:
+        people = generate_random_people(5)
+        out_path = save_people_json(people)
+        print(f"Wrote {len(people)} people to {out_path}")
@@ -10,11 +10,30 @@ Players alternate entering a number 1-9 corresponding to the board positions:
 
 Usage:
     python module2/saeed_module2_5.py
+    python module2/saeed_module2_5.py bench
 
 During play each player is prompted to enter a number for their move.
 Invalid or occupied choices are rejected and the player is re-prompted.
+Either side can be played by the computer, which never loses.
+For bigger boards and k-in-a-row rules see `saeed_module2_10.py`.
+
+Computer opponent:
+- A board is encoded as a base-3 integer: cell i contributes
+  digit * 3**i, with digit 0 = empty, 1 = X, 2 = O.
+- `WINNERS[code]` is precomputed for all 3**9 codes, so `check_winner`
+  is one table lookup.
+- Minimax runs once over every reachable position, memoized with
+  `functools.lru_cache`. The 8 rotations/reflections of a board share one
+  canonical code (the smallest of their codes), so only ~765 positions are
+  solved. The results are saved to `TABLE_FILE` and loaded on later runs;
+  it lives in the user cache directory ($XDG_CACHE_HOME or ~/.cache), or
+  wherever the TICTACTOE_TABLE environment variable points.
 """
-from typing import List
+import json
+import os
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 
 WIN_COMBINATIONS = [
@@ -40,13 +59,201 @@ def display_board(board: List[str]) -> None:
     print(f" {p(6)} | {p(7)} | {p(8)}")
 
 
-def check_winner(board: List[str]) -> str | None:
+DIGITS = {"": 0, "X": 1, "O": 2}
+SYMBOLS = ("", "X", "O")
+POWERS = [3 ** i for i in range(9)]
+
+# The 8 symmetries of the board as index permutations:
+# transformed[i] = board[perm[i]]
+_ROTATE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_MIRROR = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _symmetries() -> List[Tuple[int, ...]]:
+    perms = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        perms.append(perm)
+        perms.append(tuple(perm[m] for m in _MIRROR))
+        perm = tuple(perm[r] for r in _ROTATE)
+    return perms
+
+
+SYMMETRIES = _symmetries()
+
+TABLE_FILE = os.environ.get("TICTACTOE_TABLE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "saeed_module2", "tictactoe_table.json")
+
+
+def _winner_slow(board: List[str]) -> str | None:
     for a, b, c in WIN_COMBINATIONS:
         if board[a] and board[a] == board[b] == board[c]:
             return board[a]
     return None
 
 
+def decode(code: int) -> List[str]:
+    return [SYMBOLS[(code // POWERS[i]) % 3] for i in range(9)]
+
+
+def encode(board: List[str]) -> int:
+    return sum(DIGITS[cell] * POWERS[i] for i, cell in enumerate(board))
+
+
+WINNERS: List[str | None] = [_winner_slow(decode(code)) for code in range(3 ** 9)]
+
+
+def check_winner(board: List[str]) -> str | None:
+    return WINNERS[encode(board)]
+
+
+def canonical(code: int) -> Tuple[int, Tuple[int, ...]]:
+    """Return the smallest code among the 8 symmetric boards and its permutation."""
+    digits = [(code // POWERS[i]) % 3 for i in range(9)]
+    return min(
+        (sum(digits[perm[i]] * POWERS[i] for i in range(9)), perm)
+        for perm in SYMMETRIES
+    )
+
+
+def _to_move(code: int) -> int:
+    digits = [(code // POWERS[i]) % 3 for i in range(9)]
+    return 1 if digits.count(1) == digits.count(2) else 2
+
+
+@lru_cache(maxsize=None)
+def solve(code: int) -> Tuple[int, int]:
+    """Minimax on a canonical code: (score for the player to move, best cell).
+
+    Scores are 10 - plies for a win, 0 for a draw and negative for a loss,
+    so faster wins and slower losses are preferred. The best cell is -1 for
+    finished games.
+    """
+    if WINNERS[code] is not None:
+        # the previous player just won
+        return -10, -1
+    empty = [i for i in range(9) if (code // POWERS[i]) % 3 == 0]
+    if not empty:
+        return 0, -1
+    digit = _to_move(code)
+    best_score, best_cell = -100, -1
+    for cell in empty:
+        child, _ = canonical(code + digit * POWERS[cell])
+        score = -solve(child)[0]
+        score -= 1 if score > 0 else (-1 if score < 0 else 0)
+        if score > best_score:
+            best_score, best_cell = score, cell
+    return best_score, best_cell
+
+
+_TABLE: Dict[int, Tuple[int, int]] = {}
+
+
+def build_table() -> Dict[int, Tuple[int, int]]:
+    """Solve every reachable canonical position."""
+    table = {}
+    stack = [0]
+    while stack:
+        code = stack.pop()
+        if code in table:
+            continue
+        table[code] = solve(code)
+        if WINNERS[code] is None:
+            digit = _to_move(code)
+            for i in range(9):
+                if (code // POWERS[i]) % 3 == 0:
+                    stack.append(canonical(code + digit * POWERS[i])[0])
+    return table
+
+
+def _parse_table(data) -> Dict[int, Tuple[int, int]]:
+    table = {}
+    for key, value in data.items():
+        score, cell = value
+        if not (isinstance(score, int) and isinstance(cell, int) and -1 <= cell < 9):
+            raise ValueError(f"bad table entry for {key!r}")
+        table[int(key)] = (score, cell)
+    if 0 not in table:
+        raise KeyError(0)
+    return table
+
+
+def load_table(path: str = TABLE_FILE) -> Dict[int, Tuple[int, int]]:
+    """Load the solved table from `path`, building and saving it if needed."""
+    global _TABLE
+    if not _TABLE:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                _TABLE = _parse_table(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # missing, unreadable or wrong shape: rebuild and overwrite
+            _TABLE = build_table()
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(_TABLE, f, separators=(",", ":"))
+            except OSError:
+                pass
+    return _TABLE
+
+
+def best_move(board: List[str]) -> int:
+    """Return the index (0-8) of a perfect move for the player to move."""
+    code, perm = canonical(encode(board))
+    entry = load_table().get(code)
+    if entry is None:
+        # not reachable by legal play (e.g. hand-made board): solve directly
+        entry = solve(code)
+    cell = entry[1]
+    if cell < 0:
+        raise ValueError("the game is already over")
+    # cell is in the canonical orientation: canonical[cell] = board[perm[cell]]
+    return perm[cell]
+
+
+def naive_minimax(board: List[str], player: str) -> int:
+    """Plain recursive minimax without memoization, used by `benchmark`."""
+    winner = _winner_slow(board)
+    if winner is not None:
+        return -1
+    if all(board):
+        return 0
+    other = "O" if player == "X" else "X"
+    best = -2
+    for i in range(9):
+        if not board[i]:
+            board[i] = player
+            best = max(best, -naive_minimax(board, other))
+            board[i] = ""
+    return best
+
+
+def benchmark() -> dict:
+    """Compare naive minimax from the empty board with table lookups."""
+    t0 = time.perf_counter()
+    naive_minimax([""] * 9, "X")
+    naive = time.perf_counter() - t0
+
+    solve.cache_clear()
+    t0 = time.perf_counter()
+    table = build_table()
+    build = time.perf_counter() - t0
+
+    boards = [decode(code) for code, (_, cell) in table.items() if cell >= 0]
+    t0 = time.perf_counter()
+    for board in boards:
+        best_move(board)
+    lookup = (time.perf_counter() - t0) / len(boards)
+
+    return {
+        "naive_minimax_s": round(naive, 3),
+        "table_build_s": round(build, 3),
+        "canonical_positions": len(table),
+        "lookup_us": round(lookup * 1e6, 2),
+    }
+
+
 def is_full(board: List[str]) -> bool:
     return all(cell != "" for cell in board)
 
@@ -68,22 +275,32 @@ def get_move(player: str, board: List[str]) -> int:
             print("Invalid input. Enter the number of an empty cell (1-9).")
 
 
-def play_game() -> None:
+def play_game(computer: Optional[str] = None) -> None:
+    """Play one game; `computer` is "X", "O" or None for two humans."""
     board: List[str] = [""] * 9
     current = "X"
+    # the board code and move count are updated per move instead of rescanning
+    code = 0
+    moves = 0
 
     while True:
         display_board(board)
-        move = get_move(current, board)
+        if current == computer:
+            move = best_move(board)
+            print(f"Computer ({current}) plays {move + 1}")
+        else:
+            move = get_move(current, board)
         board[move] = current
+        code += DIGITS[current] * POWERS[move]
+        moves += 1
 
-        winner = check_winner(board)
+        winner = WINNERS[code]
         if winner:
             display_board(board)
             print(f"Player {winner} wins!")
             break
 
-        if is_full(board):
+        if moves == 9:
             display_board(board)
             print("It's a draw.")
             break
@@ -91,10 +308,19 @@ def play_game() -> None:
         current = "O" if current == "X" else "X"
 
 
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        print(benchmark())
+        sys.exit(0)
 
     print("Welcome to Tic-Tac-Toe")
     while True:
-        play_game()
+        choice = input("Play against the computer? (x = you are X, o = you are O, n = two players): ")
+        choice = choice.strip().lower()
+        computer = {"x": "O", "o": "X"}.get(choice)
+        play_game(computer)
         again = input("Play again? (y/n): ").strip().lower()
         if again != "y":
             print("Goodbye!")
@@ -2,141 +2,406 @@
 # This code creates a simple console-based version of the 2048 game.
 # Players can move tiles using 'w', 'a', 's', 'd' keys to slide tiles up, left, down, and right respectively.
 # The game ends when the player reaches the 2048 tile or when no moves are possible.
-# Rafrance https://en.wikipedia.org/wiki/2048_(video_game)
-import random
+# The board is a bitboard from saeed_module2_8; type 'hint' for an AI suggestion or 'auto' to let the AI play on.
+# Drawing goes through a renderer:
+#   AnsiRenderer  - terminal, redraws only the cells that changed in one write
+#   NullRenderer  - draws nothing (headless runs, e.g. with 'auto')
+#   JsonRenderer  - writes one JSON line per frame for replay
+# Saves are binary: 2048_save.bin holds a snapshot (packed board, score) and
+# 2048_save.journal gets one 4-byte record per move when journaling is on.
+# The old 2048_save.json format can still be imported and exported.
+# Usage: python module2/saeed_module2_6.py [ansi | null | json <frames.jsonl>] [auto] [journal]
+# Reference https://en.wikipedia.org/wiki/2048_(video_game)
 import os
 import sys
 import json
+import struct
+import time
+import zlib
 
-SAVE_FILE = '2048_save.json'
+import saeed_module2_8 as engine
+
+SAVE_FILE = '2048_save.bin'
+JOURNAL_FILE = '2048_save.journal'
+JSON_SAVE_FILE = '2048_save.json'
+
+
+class SaveFile:
+    """Binary save: a small snapshot file plus an append-only move journal.
+
+    Snapshot: magic, version, generation, board, score, then a CRC32 of
+    those bytes. It is written to a temporary file and renamed into place.
+
+    Journal: a header with the snapshot's generation, then one 4-byte record
+    per move (direction, spawned cell/rank, 16-bit checksum over the record
+    and its sequence number). A journal whose generation does not match the
+    snapshot is stale and ignored; a short or corrupt record marks a torn
+    write, and everything from there on is dropped (and truncated away on
+    the next append).
+    """
+
+    SNAPSHOT = struct.Struct('<4sHQQQ')
+    JOURNAL_HEADER = struct.Struct('<4sHQ')
+    RECORD = struct.Struct('<BBH')
+    CRC = struct.Struct('<I')
+    VERSION = 1
+
+    def __init__(self, path=SAVE_FILE, journal_path=JOURNAL_FILE):
+        self.path = path
+        self.journal_path = journal_path
+        self.generation = 0
+        self.records = 0
+        self.valid_size = None
+        self.journal = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def write_snapshot(self, board, score):
+        """Write a new snapshot and start an empty journal for it."""
+        self.close()
+        self.generation += 1
+        data = self.SNAPSHOT.pack(b'2048', self.VERSION, self.generation, board, score)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data + self.CRC.pack(zlib.crc32(data)))
+        os.replace(tmp, self.path)
+        with open(self.journal_path, 'wb') as f:
+            f.write(self.JOURNAL_HEADER.pack(b'G48J', self.VERSION, self.generation))
+        self.records = 0
+        self.valid_size = self.JOURNAL_HEADER.size
+
+    def _checksum(self, direction, spawn, seq):
+        return zlib.crc32(bytes((direction, spawn)) + seq.to_bytes(4, 'little')) & 0xFFFF
+
+    def append(self, direction, spawn_cell, spawn_rank):
+        """Record one move: a single 4-byte write to the journal."""
+        if self.journal is None:
+            self.journal = open(self.journal_path, 'r+b', buffering=0)
+            self.journal.truncate(self.valid_size)
+            self.journal.seek(self.valid_size)
+        d = engine.DIRECTIONS.index(direction)
+        spawn = spawn_cell << 4 | spawn_rank
+        self.journal.write(self.RECORD.pack(d, spawn, self._checksum(d, spawn, self.records)))
+        self.records += 1
+        self.valid_size += self.RECORD.size
+
+    def read(self):
+        """Rebuild the game from the snapshot plus the journal tail.
+
+        Returns (board, score, moves, torn) where `moves` is the list of
+        journaled directions and `torn` tells whether a damaged tail was found.
+        """
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        body, crc = data[:self.SNAPSHOT.size], data[self.SNAPSHOT.size:]
+        if len(crc) != self.CRC.size or self.CRC.unpack(crc)[0] != zlib.crc32(body):
+            raise ValueError(f"{self.path} is damaged")
+        magic, version, generation, board, score = self.SNAPSHOT.unpack(body)
+        if magic != b'2048' or version != self.VERSION:
+            raise ValueError(f"{self.path} is not a 2048 save file")
+        self.generation = generation
+
+        moves = []
+        torn = False
+        self.records = 0
+        self.valid_size = None
+        try:
+            with open(self.journal_path, 'rb') as f:
+                journal = f.read()
+        except FileNotFoundError:
+            journal = b''
+        header = self.JOURNAL_HEADER
+        if len(journal) >= header.size and header.unpack_from(journal) == (b'G48J', self.VERSION, generation):
+            pos = header.size
+            while pos + self.RECORD.size <= len(journal):
+                d, spawn, check = self.RECORD.unpack_from(journal, pos)
+                if d >= 4 or check != self._checksum(d, spawn, self.records):
+                    break
+                direction = engine.DIRECTIONS[d]
+                board, points = engine.move(board, direction)
+                board |= (spawn & 0xF) << 4 * (spawn >> 4)
+                score += points
+                moves.append(direction)
+                self.records += 1
+                pos += self.RECORD.size
+            torn = pos != len(journal)
+            self.valid_size = pos
+        if self.valid_size is None:
+            # missing or stale journal: start a fresh one for this snapshot
+            with open(self.journal_path, 'wb') as f:
+                f.write(header.pack(b'G48J', self.VERSION, generation))
+            self.valid_size = header.size
+        return board, score, moves, torn
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def remove(self):
+        self.close()
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class Renderer:
+    """Base renderer: times every frame so input-to-draw latency can be measured."""
 
-class Game2048:
     def __init__(self):
-        self.grid = [[0] * 4 for _ in range(4)]
+        self.frames = 0
+        self.draw_seconds = 0.0
+        self.latencies = []
+
+    def render(self, game, since=None):
+        # `since` is the perf_counter() value when the input for this frame arrived
+        start = time.perf_counter()
+        self.draw(game)
+        end = time.perf_counter()
+        self.frames += 1
+        self.draw_seconds += end - start
+        if since is not None:
+            self.latencies.append(end - since)
+
+    def draw(self, game):
+        raise NotImplementedError
+
+    def message(self, text):
+        pass
+
+    def close(self):
+        pass
+
+    def stats(self):
+        lat = sorted(self.latencies)
+        return {
+            "frames": self.frames,
+            "avg_draw_ms": 1000 * self.draw_seconds / self.frames if self.frames else 0.0,
+            "p50_latency_ms": 1000 * lat[len(lat) // 2] if lat else 0.0,
+            "max_latency_ms": 1000 * lat[-1] if lat else 0.0,
+        }
+
+
+class NullRenderer(Renderer):
+    def draw(self, game):
+        pass
+
+
+class AnsiRenderer(Renderer):
+    """Terminal renderer using ANSI cursor movement instead of clearing the screen.
+
+    The first frame draws the whole board; later frames only rewrite the
+    score and the cells that changed. Each frame is a single write + flush.
+    """
+
+    # screen layout (1-based terminal rows): score, border, then cell rows
+    # every other line starting at row 3; messages/prompt start at row 11
+    STATUS_ROW = 11
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.prev_grid = None
+        self.prev_score = None
+
+    def draw(self, game):
+        grid = game.grid
+        out = []
+        if self.prev_grid is None:
+            out.append("\x1b[2J\x1b[H")
+            out.append(f"Score: {game.score}\n")
+            out.append("+----+----+----+----+\n")
+            for row in grid:
+                out.append("|" + "".join(f"{cell:4}|" if cell else "    |" for cell in row) + "\n")
+                out.append("+----+----+----+----+\n")
+        else:
+            if game.score != self.prev_score:
+                out.append(f"\x1b[1;1HScore: {game.score}\x1b[K")
+            for i, row in enumerate(grid):
+                for j, cell in enumerate(row):
+                    if cell != self.prev_grid[i][j]:
+                        text = f"{cell:4}" if cell else "    "
+                        out.append(f"\x1b[{3 + 2 * i};{2 + 5 * j}H{text}")
+        # clear old messages/prompt and leave the cursor where the prompt goes
+        out.append(f"\x1b[{self.STATUS_ROW};1H\x1b[J")
+        self.stream.write("".join(out))
+        self.stream.flush()
+        self.prev_grid = grid
+        self.prev_score = game.score
+
+    def message(self, text):
+        self.stream.write(text + "\n")
+        self.stream.flush()
+
+
+class JsonRenderer(Renderer):
+    """Append one JSON object per frame (grid, score, last move) to a file."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.file = open(path, 'a')
+
+    def draw(self, game):
+        frame = {'frame': self.frames, 'time': time.time(), 'move': game.last_move,
+                 'score': game.score, 'grid': game.grid}
+        self.file.write(json.dumps(frame) + "\n")
+
+    def message(self, text):
+        self.file.write(json.dumps({'message': text}) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+RENDERERS = {'ansi': AnsiRenderer, 'null': NullRenderer, 'json': JsonRenderer}
+
+
+class Game2048:
+    def __init__(self, renderer=None, journal=False, save_file=None):
+        self.board = 0
         self.score = 0
-        if os.path.exists(SAVE_FILE):
+        self.ai = None
+        self.last_move = None
+        self.renderer = renderer or AnsiRenderer()
+        self.save_file = save_file or SaveFile()
+        self.journal = journal
+        if self.save_file.exists():
             self.load()
+        elif os.path.exists(JSON_SAVE_FILE):
+            self.import_json(JSON_SAVE_FILE)
         else:
             self.add_new_tile()
             self.add_new_tile()
+        if self.journal and not self.save_file.exists():
+            # the journal needs a snapshot to replay from
+            self.save()
+
+    @property
+    def grid(self):
+        return engine.to_grid(self.board)
+
+    @grid.setter
+    def grid(self, grid):
+        self.board = engine.to_board(grid)
 
     def add_new_tile(self):
-        empty_cells = [(i, j) for i in range(4) for j in range(4) if self.grid[i][j] == 0]
-        if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+        self.board = engine.spawn_tile(self.board)
 
     def save(self):
-        with open(SAVE_FILE, 'w') as f:
-            json.dump({'grid': self.grid, 'score': self.score}, f)
+        self.save_file.write_snapshot(self.board, self.score)
 
     def load(self):
-        with open(SAVE_FILE, 'r') as f:
+        self.board, self.score, _, _ = self.save_file.read()
+
+    def export_json(self, path=JSON_SAVE_FILE):
+        with open(path, 'w') as f:
+            json.dump({'grid': self.grid, 'score': self.score}, f)
+
+    def import_json(self, path=JSON_SAVE_FILE):
+        with open(path, 'r') as f:
             data = json.load(f)
             self.grid = data['grid']
             self.score = data['score']
 
-    def display(self):
-        os.system('clear' if os.name == 'posix' else 'cls')
-        print("Score:", self.score)
-        print("+----+----+----+----+")
-        for row in self.grid:
-            print("|", end="")
-            for cell in row:
-                if cell == 0:
-                    print("    |", end="")
-                else:
-                    print(f"{cell:4}|", end="")
-            print()
-            print("+----+----+----+----+")
+    def remove_save(self):
+        self.save_file.remove()
+        if os.path.exists(JSON_SAVE_FILE):
+            os.remove(JSON_SAVE_FILE)
+
+    def display(self, since=None):
+        self.renderer.render(self, since)
 
     def move(self, direction):
-        moved = False
-        if direction == 'up':
-            for j in range(4):
-                col = [self.grid[i][j] for i in range(4)]
-                new_col = self.slide_and_merge(col)
-                for i in range(4):
-                    if self.grid[i][j] != new_col[i]:
-                        moved = True
-                    self.grid[i][j] = new_col[i]
-        elif direction == 'down':
-            for j in range(4):
-                col = [self.grid[i][j] for i in range(3, -1, -1)]
-                new_col = self.slide_and_merge(col)
-                for i in range(3, -1, -1):
-                    if self.grid[i][j] != new_col[3-i]:
-                        moved = True
-                    self.grid[i][j] = new_col[3-i]
-        elif direction == 'left':
-            for i in range(4):
-                row = self.grid[i]
-                new_row = self.slide_and_merge(row)
-                if self.grid[i] != new_row:
-                    moved = True
-                self.grid[i] = new_row
-        elif direction == 'right':
-            for i in range(4):
-                row = self.grid[i][::-1]
-                new_row = self.slide_and_merge(row)[::-1]
-                if self.grid[i] != new_row:
-                    moved = True
-                self.grid[i] = new_row
-        if moved:
+        # The bitboard engine slides the whole board with table lookups
+        new_board, points = engine.move(self.board, direction)
+        self.last_move = direction
+        if new_board != self.board:
+            self.board = new_board
+            self.score += points
             self.add_new_tile()
+            if self.journal:
+                spawned = self.board ^ new_board
+                cell = (spawned.bit_length() - 1) // 4
+                self.save_file.append(direction, cell, spawned >> 4 * cell)
 
     def slide_and_merge(self, line):
-        # Remove zeros
-        line = [x for x in line if x != 0]
-        # Merge
-        for i in range(len(line) - 1):
-            if line[i] == line[i+1]:
-                line[i] *= 2
-                self.score += line[i]
-                line[i+1] = 0
-        # Remove zeros again
-        line = [x for x in line if x != 0]
-        # Pad with zeros
-        line += [0] * (4 - len(line))
+        line, points = engine.slide_row(line)
+        self.score += points
         return line
 
+    def suggest_move(self):
+        # Ask the expectimax AI for the best direction (None if stuck)
+        if self.ai is None:
+            self.ai = engine.ExpectimaxAI()
+        return self.ai.suggest(self.board)
+
     def is_win(self):
-        return any(2048 in row for row in self.grid)
+        return engine.max_tile(self.board) >= 2048
 
     def is_lose(self):
-        if any(0 in row for row in self.grid):
-            return False
-        for i in range(4):
-            for j in range(4):
-                if (i < 3 and self.grid[i][j] == self.grid[i+1][j]) or (j < 3 and self.grid[i][j] == self.grid[i][j+1]):
-                    return False
-        return True
-
-def main():
-    game = Game2048()
+        return not engine.can_move(self.board)
+
+
+def main(renderer=None, auto=False, journal=False):
+    game = Game2048(renderer, journal)
+    say = game.renderer.message
+    since = None
     while True:
-        game.display()
+        game.display(since)
         if game.is_win():
-            print("You win!")
-            os.remove(SAVE_FILE) if os.path.exists(SAVE_FILE) else None
+            say("You win!")
+            game.remove_save()
             break
         if game.is_lose():
-            print("You lose!")
-            os.remove(SAVE_FILE) if os.path.exists(SAVE_FILE) else None
+            say("You lose!")
+            game.remove_save()
             break
-        move = input("Move (w/a/s/d), save, quit: ").lower()
+        if auto:
+            direction = game.suggest_move()
+            since = time.perf_counter()
+            game.move(direction)
+            continue
+        move = input("Move (w/a/s/d), hint, auto, save, export, quit: ").lower()
+        since = time.perf_counter()
         if move in ['w', 'a', 's', 'd']:
             direction = {'w': 'up', 'a': 'left', 's': 'down', 'd': 'right'}[move]
             game.move(direction)
+        elif move == 'hint':
+            input(f"Suggested move: {game.suggest_move()} (press Enter)")
+        elif move == 'auto':
+            auto = True
         elif move == 'save':
             game.save()
-            print("Game saved!")
+            say("Game saved!")
+        elif move == 'export':
+            game.export_json()
+            say(f"Game exported to {JSON_SAVE_FILE}")
         elif move == 'quit':
             game.save()
-            print("Game saved. Goodbye!")
+            say("Game saved. Goodbye!")
             break
         else:
-            print("Invalid move")
+            say("Invalid move")
+    game.save_file.close()
+    game.renderer.close()
+    return game
+
+
+def cli(argv):
+    # argv: [ansi | null | json <path>] [auto] [journal]
+    flags = {a for a in argv if a in ('auto', 'journal')}
+    args = [a for a in argv if a not in flags]
+    name = args[0] if args else 'ansi'
+    expected = 1 if name == 'json' else 0  # extra arguments the renderer takes
+    if name not in RENDERERS or len(args) - 1 != expected:
+        print(f"Usage: python {sys.argv[0]} [ansi | null | json <frames.jsonl>] [auto] [journal]")
+        return
+    renderer = RENDERERS[name](*args[1:])
+    game = main(renderer, 'auto' in flags, 'journal' in flags)
+    if name != 'ansi':
+        print(f"Score: {game.score}", renderer.stats())
 
 
-   
\ No newline at end of file
+if __name__ == "__main__":
+    cli(sys.argv[1:])
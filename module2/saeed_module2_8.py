@@ -0,0 +1,346 @@
+"""Bitboard engine and expectimax AI for the 2048 game.
+
+The whole 4x4 board is stored in one 64-bit integer: every cell is a 4-bit
+nibble holding the tile's exponent (0 = empty, 1 = 2, 2 = 4, ... 15 = 32768).
+Cell (row, col) lives at bit offset 4 * (4 * row + col), so each row is a
+16-bit value. All 65536 possible rows are slid/merged once when the module is
+imported, which turns a move into four table lookups:
+
+- `ROW_LEFT[row]` / `ROW_RIGHT[row]` : the row after sliding left / right
+- `ROW_SCORE[row]` : points scored by the merges in that row
+- `ROW_HEURISTIC[row]` : static evaluation of the row used by the AI
+
+Up/down moves transpose the board, move left/right and transpose back.
+Merging two 32768 tiles is not supported (a nibble tops out at 15).
+
+The expectimax AI alternates max nodes (the player's four moves) and chance
+nodes (a 2 with probability 0.9 or a 4 with probability 0.1 on every empty
+cell). Chance nodes are cached in a transposition table keyed by board, so
+positions reached through different move orders are only searched once.
+
+Usage:
+    python module2/saeed_module2_8.py            # AI plays one game
+    python module2/saeed_module2_8.py bench      # moves per second
+"""
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+ROW_MASK = 0xFFFF
+
+# Heuristic weights (see ROW_HEURISTIC)
+SCORE_LOST_PENALTY = 200000.0
+SCORE_MONOTONICITY_POWER = 4.0
+SCORE_MONOTONICITY_WEIGHT = 47.0
+SCORE_SUM_POWER = 3.5
+SCORE_SUM_WEIGHT = 11.0
+SCORE_MERGES_WEIGHT = 700.0
+SCORE_EMPTY_WEIGHT = 270.0
+
+# Chance branches less likely than this are evaluated with the heuristic
+CPROB_THRESHOLD = 0.0001
+
+
+def _reverse_row(row: int) -> int:
+    return (row >> 12) | ((row >> 4) & 0x00F0) | ((row << 4) & 0x0F00) | ((row << 12) & 0xF000)
+
+
+def _slide_line(line: List[int]) -> Tuple[List[int], int]:
+    """Slide exponents in `line` towards index 0, merging equal neighbours once.
+
+    Same rules as `Game2048.slide_and_merge`, but on exponents.
+    Returns the new line and the points scored.
+    """
+    tiles = [x for x in line if x != 0]
+    out: List[int] = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] != 0xF:
+            out.append(tiles[i] + 1)
+            score += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            out.append(tiles[i])
+            i += 1
+    return out + [0] * (len(line) - len(out)), score
+
+
+def _row_heuristic(line: List[int]) -> float:
+    empty = 0
+    merges = 0
+    prev = 0
+    counter = 0
+    total = 0.0
+    for rank in line:
+        total += rank ** SCORE_SUM_POWER
+        if rank == 0:
+            empty += 1
+        elif prev == rank:
+            counter += 1
+        else:
+            if counter > 0:
+                merges += 1 + counter
+            counter = 0
+            prev = rank
+    if counter > 0:
+        merges += 1 + counter
+
+    mono_left = 0.0
+    mono_right = 0.0
+    for a, b in zip(line, line[1:]):
+        if a > b:
+            mono_left += a ** SCORE_MONOTONICITY_POWER - b ** SCORE_MONOTONICITY_POWER
+        else:
+            mono_right += b ** SCORE_MONOTONICITY_POWER - a ** SCORE_MONOTONICITY_POWER
+
+    return (SCORE_LOST_PENALTY + SCORE_EMPTY_WEIGHT * empty + SCORE_MERGES_WEIGHT * merges
+            - SCORE_MONOTONICITY_WEIGHT * min(mono_left, mono_right) - SCORE_SUM_WEIGHT * total)
+
+
+def _build_tables() -> Tuple[List[int], List[int], List[int], List[float]]:
+    left = [0] * 65536
+    right = [0] * 65536
+    score = [0] * 65536
+    heuristic = [0.0] * 65536
+    for row in range(65536):
+        line = [(row >> 4 * i) & 0xF for i in range(4)]
+        moved, points = _slide_line(line)
+        result = moved[0] | moved[1] << 4 | moved[2] << 8 | moved[3] << 12
+        left[row] = result
+        right[_reverse_row(row)] = _reverse_row(result)
+        score[row] = points
+        heuristic[row] = _row_heuristic(line)
+    return left, right, score, heuristic
+
+
+ROW_LEFT, ROW_RIGHT, ROW_SCORE, ROW_HEURISTIC = _build_tables()
+
+
+def transpose(board: int) -> int:
+    """Swap rows and columns of `board`."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _move_rows(board: int, table: List[int]) -> Tuple[int, int]:
+    r0 = board & ROW_MASK
+    r1 = (board >> 16) & ROW_MASK
+    r2 = (board >> 32) & ROW_MASK
+    r3 = board >> 48
+    moved = table[r0] | table[r1] << 16 | table[r2] << 32 | table[r3] << 48
+    return moved, ROW_SCORE[r0] + ROW_SCORE[r1] + ROW_SCORE[r2] + ROW_SCORE[r3]
+
+
+def move(board: int, direction: str) -> Tuple[int, int]:
+    """Apply `direction` ("up", "down", "left", "right") to `board`.
+
+    Returns the new board and the points scored. The board is unchanged when
+    the move is not possible. No new tile is added.
+    """
+    if direction == "left":
+        return _move_rows(board, ROW_LEFT)
+    if direction == "right":
+        return _move_rows(board, ROW_RIGHT)
+    if direction == "up":
+        moved, points = _move_rows(transpose(board), ROW_LEFT)
+    elif direction == "down":
+        moved, points = _move_rows(transpose(board), ROW_RIGHT)
+    else:
+        raise ValueError(f"unknown direction: {direction!r}")
+    return transpose(moved), points
+
+
+def slide_row(line: List[int]) -> Tuple[List[int], int]:
+    """Slide a row of 4 tile values (0, 2, 4, ...) left using the lookup tables.
+
+    Returns the new row and the points scored.
+    """
+    row = 0
+    for i, value in enumerate(line):
+        row |= (value.bit_length() - 1 if value else 0) << 4 * i
+    moved = ROW_LEFT[row]
+    return [1 << r if r else 0 for r in ((moved >> 4 * i) & 0xF for i in range(4))], ROW_SCORE[row]
+
+
+def to_board(grid: List[List[int]]) -> int:
+    """Pack a 4x4 list of tile values into a bitboard."""
+    board = 0
+    for i, row in enumerate(grid):
+        for j, value in enumerate(row):
+            if value:
+                board |= (value.bit_length() - 1) << 4 * (4 * i + j)
+    return board
+
+
+def to_grid(board: int) -> List[List[int]]:
+    """Unpack a bitboard into a 4x4 list of tile values."""
+    grid = []
+    for i in range(4):
+        row = []
+        for j in range(4):
+            rank = (board >> 4 * (4 * i + j)) & 0xF
+            row.append(1 << rank if rank else 0)
+        grid.append(row)
+    return grid
+
+
+def empty_cells(board: int) -> List[int]:
+    """Return the nibble indices (0-15) of the empty cells."""
+    return [i for i in range(16) if not (board >> 4 * i) & 0xF]
+
+
+def count_empty(board: int) -> int:
+    return sum(1 for i in range(16) if not (board >> 4 * i) & 0xF)
+
+
+def max_tile(board: int) -> int:
+    rank = max((board >> 4 * i) & 0xF for i in range(16))
+    return 1 << rank if rank else 0
+
+
+def can_move(board: int) -> bool:
+    return any(move(board, d)[0] != board for d in DIRECTIONS)
+
+
+def spawn_tile(board: int, rng: Optional[random.Random] = None) -> int:
+    """Put a 2 (90%) or 4 (10%) on a random empty cell of `board`."""
+    rng = rng or random
+    cells = empty_cells(board)
+    if not cells:
+        return board
+    cell = rng.choice(cells)
+    rank = 1 if rng.random() < 0.9 else 2
+    return board | rank << 4 * cell
+
+
+def heuristic(board: int) -> float:
+    """Static evaluation of `board`: row scores plus column scores."""
+    t = transpose(board)
+    h = ROW_HEURISTIC
+    return (h[board & ROW_MASK] + h[(board >> 16) & ROW_MASK]
+            + h[(board >> 32) & ROW_MASK] + h[board >> 48]
+            + h[t & ROW_MASK] + h[(t >> 16) & ROW_MASK]
+            + h[(t >> 32) & ROW_MASK] + h[t >> 48])
+
+
+class ExpectimaxAI:
+    """Expectimax search over bitboards with a transposition table.
+
+    `depth` is the number of player moves searched. When it is None, the
+    depth grows with the number of distinct tiles on the board, like most
+    2048 solvers do, capped at `max_depth`.
+    """
+
+    def __init__(self, depth: Optional[int] = None, max_depth: int = 2):
+        self.depth = depth
+        self.max_depth = max_depth
+        self.cache: Dict[int, Tuple[int, float]] = {}
+        self.nodes = 0
+        self.cache_hits = 0
+
+    def _depth_for(self, board: int) -> int:
+        if self.depth is not None:
+            return self.depth
+        distinct = len({(board >> 4 * i) & 0xF for i in range(16)} - {0})
+        return max(1, min(self.max_depth, distinct - 5))
+
+    def _max_node(self, board: int, depth: int, cprob: float) -> float:
+        best = 0.0
+        for d in DIRECTIONS:
+            moved, _ = move(board, d)
+            if moved != board:
+                best = max(best, self._chance_node(moved, depth - 1, cprob))
+        return best
+
+    def _chance_node(self, board: int, depth: int, cprob: float) -> float:
+        self.nodes += 1
+        if depth <= 0 or cprob < CPROB_THRESHOLD:
+            return heuristic(board)
+        cached = self.cache.get(board)
+        if cached is not None and cached[0] >= depth:
+            self.cache_hits += 1
+            return cached[1]
+
+        cells = empty_cells(board)
+        if not cells:
+            return heuristic(board)
+        cprob /= len(cells)
+        total = 0.0
+        for cell in cells:
+            shift = 4 * cell
+            total += 0.9 * self._max_node(board | 1 << shift, depth, cprob * 0.9)
+            total += 0.1 * self._max_node(board | 2 << shift, depth, cprob * 0.1)
+        value = total / len(cells)
+        self.cache[board] = (depth, value)
+        return value
+
+    def suggest(self, board: int) -> Optional[str]:
+        """Return the best direction for `board`, or None if no move is possible."""
+        self.cache.clear()
+        depth = self._depth_for(board)
+        best_dir = None
+        best = -1.0
+        for d in DIRECTIONS:
+            moved, _ = move(board, d)
+            if moved == board:
+                continue
+            value = self._chance_node(moved, depth, 1.0)
+            if value > best:
+                best, best_dir = value, d
+        return best_dir
+
+
+def auto_play(board: int = 0, score: int = 0, ai: Optional[ExpectimaxAI] = None,
+              rng: Optional[random.Random] = None,
+              max_moves: Optional[int] = None) -> Tuple[int, int, int]:
+    """Let `ai` play from `board` until no move is left (or `max_moves`).
+
+    An empty board gets its two starting tiles first.
+    Returns the final board, the score and the number of moves made.
+    """
+    ai = ai or ExpectimaxAI()
+    if board == 0:
+        board = spawn_tile(spawn_tile(0, rng), rng)
+    moves = 0
+    while max_moves is None or moves < max_moves:
+        direction = ai.suggest(board)
+        if direction is None:
+            break
+        board, points = move(board, direction)
+        score += points
+        board = spawn_tile(board, rng)
+        moves += 1
+    return board, score, moves
+
+
+def benchmark(n_moves: int = 1_000_000, seed: int = 0) -> dict:
+    """Measure raw engine speed in moves per second on random positions."""
+    rng = random.Random(seed)
+    boards = [rng.getrandbits(64) for _ in range(1024)]
+    t0 = time.perf_counter()
+    for i in range(n_moves):
+        move(boards[i & 1023], DIRECTIONS[i & 3])
+    elapsed = time.perf_counter() - t0
+    return {"moves": n_moves, "seconds": round(elapsed, 3),
+            "moves_per_second": int(n_moves / elapsed)}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        print(benchmark())
+    else:
+        board, score, moves = auto_play()
+        for row in to_grid(board):
+            print(" ".join(f"{cell:5}" for cell in row))
+        print(f"Score: {score}  Moves: {moves}  Max tile: {max_tile(board)}")
@@ -0,0 +1,231 @@
+"""Headless batched Monte-Carlo self-play simulator for 2048.
+
+Plays many games at once. All boards live in one NumPy array of shape
+(N, 4, 4) holding tile exponents (0 = empty, 1 = 2, 2 = 4, ...), the same
+encoding as the bitboard engine in `saeed_module2_8`. Every turn:
+
+- each board row is packed into a 16-bit index and slid with the engine's
+  `ROW_LEFT` / `ROW_RIGHT` lookup tables (columns go through a transpose),
+  so all four moves of all boards are computed with a few array operations;
+- a strategy picks one of the valid moves per board;
+- new tiles are spawned in bulk from a seeded `numpy.random.Generator`.
+
+Games that cannot move any more are finished and dropped from the batch.
+`simulate_parallel` splits large runs into batches played by a process
+pool, each with its own independent seed stream.
+
+Requires numpy:
+    pip install numpy
+
+Usage:
+    python module2/saeed_module2_9.py [n_games] [strategy] [processes]
+"""
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import saeed_module2_8 as engine
+
+DIRECTIONS = engine.DIRECTIONS
+
+_ROW_LEFT = np.array(engine.ROW_LEFT, dtype=np.uint16)
+_ROW_RIGHT = np.array(engine.ROW_RIGHT, dtype=np.uint16)
+_ROW_SCORE = np.array(engine.ROW_SCORE, dtype=np.int64)
+_SHIFTS = np.array([0, 4, 8, 12], dtype=np.uint16)
+# per direction: (works on columns, row table sliding towards index 0 or 3)
+_PASSES = {
+    "up": (True, _ROW_LEFT),
+    "down": (True, _ROW_RIGHT),
+    "left": (False, _ROW_LEFT),
+    "right": (False, _ROW_RIGHT),
+}
+
+
+@dataclass
+class SimulationResult:
+    scores: np.ndarray
+    max_tiles: np.ndarray
+    moves: np.ndarray
+
+    def summary(self) -> Dict[str, object]:
+        """Score percentiles and how often each max tile was reached."""
+        tiles, counts = np.unique(self.max_tiles, return_counts=True)
+        pct = np.percentile(self.scores, [5, 25, 50, 75, 95]) if len(self.scores) else [0] * 5
+        return {
+            "games": int(len(self.scores)),
+            "score_mean": float(self.scores.mean()) if len(self.scores) else 0.0,
+            "score_percentiles": dict(zip(("p5", "p25", "p50", "p75", "p95"), map(float, pct))),
+            "moves_mean": float(self.moves.mean()) if len(self.moves) else 0.0,
+            "max_tile_counts": {int(t): int(c) for t, c in zip(tiles, counts)},
+        }
+
+
+def _pack_rows(boards: np.ndarray) -> np.ndarray:
+    """(N, 4, 4) exponents -> (N, 4) 16-bit row indices."""
+    return (boards.astype(np.uint16) << _SHIFTS).sum(axis=2, dtype=np.uint16)
+
+
+def _unpack_rows(rows: np.ndarray) -> np.ndarray:
+    """(N, 4) 16-bit row indices -> (N, 4, 4) exponents."""
+    return ((rows[..., None] >> _SHIFTS) & 0xF).astype(np.uint8)
+
+
+def move_all(boards: np.ndarray):
+    """Apply every direction to every board.
+
+    Returns `(moved, points, valid)` with shapes (4, N, 4, 4), (4, N) and
+    (4, N), indexed in `DIRECTIONS` order. `valid` is False where a move
+    leaves the board unchanged.
+    """
+    transposed = boards.transpose(0, 2, 1)
+    rows = _pack_rows(boards)
+    cols = _pack_rows(transposed)
+    results = []
+    points = []
+    for direction in DIRECTIONS:
+        flip, table = _PASSES[direction]
+        packed = cols if flip else rows
+        moved = _unpack_rows(table[packed])
+        results.append(moved.transpose(0, 2, 1) if flip else moved)
+        points.append(_ROW_SCORE[packed].sum(axis=1))
+    moved = np.stack(results)
+    valid = (moved != boards[None]).any(axis=(2, 3))
+    return moved, np.stack(points), valid
+
+
+def spawn_tiles(boards: np.ndarray, rng: np.random.Generator) -> None:
+    """Add a 2 (90%) or 4 (10%) on a random empty cell of each board, in place.
+
+    Boards without an empty cell are left unchanged.
+    """
+    flat = boards.reshape(len(boards), 16)
+    empty = flat == 0
+    # random keys on empty cells only; argmax picks one of them uniformly
+    keys = np.where(empty, rng.random(flat.shape), -1.0)
+    cell = keys.argmax(axis=1)
+    has_empty = empty.any(axis=1)
+    tile = np.where(rng.random(len(flat)) < 0.9, 1, 2).astype(np.uint8)
+    idx = np.nonzero(has_empty)[0]
+    flat[idx, cell[idx]] = tile[idx]
+
+
+# A strategy gets the boards, the (4, N) valid-move mask, the (4, N) points
+# each move would score and the RNG, and returns one direction index per board.
+
+def random_strategy(boards: np.ndarray, valid: np.ndarray, points: np.ndarray,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Pick a uniformly random valid move for each board."""
+    keys = np.where(valid.T, rng.random((len(boards), 4)), -1.0)
+    return keys.argmax(axis=1)
+
+
+def corner_strategy(boards: np.ndarray, valid: np.ndarray, points: np.ndarray,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Prefer down, then left, then right, then up (keeps big tiles in a corner)."""
+    order = np.array([DIRECTIONS.index(d) for d in ("down", "left", "right", "up")])
+    first = valid.T[:, order].argmax(axis=1)
+    return order[first]
+
+
+def greedy_strategy(boards: np.ndarray, valid: np.ndarray, points: np.ndarray,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Pick the valid move that scores the most points right now (random tie-break)."""
+    keys = np.where(valid.T, points.T + rng.random((len(boards), 4)), -1.0)
+    return keys.argmax(axis=1)
+
+
+STRATEGIES: Dict[str, Callable] = {
+    "random": random_strategy,
+    "corner": corner_strategy,
+    "greedy": greedy_strategy,
+}
+
+
+def simulate(n_games: int, strategy: str = "random", seed: Optional[int] = None,
+             max_moves: Optional[int] = None) -> SimulationResult:
+    """Play `n_games` games of 2048 at once with the named strategy."""
+    rng = np.random.default_rng(seed)
+    choose = STRATEGIES[strategy]
+
+    boards = np.zeros((n_games, 4, 4), dtype=np.uint8)
+    spawn_tiles(boards, rng)
+    spawn_tiles(boards, rng)
+    scores = np.zeros(n_games, dtype=np.int64)
+    moves = np.zeros(n_games, dtype=np.int64)
+    max_tiles = np.zeros(n_games, dtype=np.int64)
+    alive = np.arange(n_games)
+
+    turn = 0
+    while len(alive) and (max_moves is None or turn < max_moves):
+        moved, points, valid = move_all(boards)
+        can_move = valid.any(axis=0)
+        if not can_move.all():
+            done = alive[~can_move]
+            max_tiles[done] = 1 << boards[~can_move].reshape(len(done), 16).max(axis=1).astype(np.int64)
+            alive = alive[can_move]
+            boards, moved, points, valid = (boards[can_move], moved[:, can_move],
+                                            points[:, can_move], valid[:, can_move])
+            if not len(alive):
+                break
+
+        choice = choose(boards, valid, points, rng)
+        idx = np.arange(len(alive))
+        boards = moved[choice, idx]
+        scores[alive] += points[choice, idx]
+        moves[alive] += 1
+        spawn_tiles(boards, rng)
+        turn += 1
+
+    if len(alive):
+        max_tiles[alive] = 1 << boards.reshape(len(alive), 16).max(axis=1).astype(np.int64)
+    return SimulationResult(scores=scores, max_tiles=max_tiles, moves=moves)
+
+
+def _simulate_batch(args) -> SimulationResult:
+    n_games, strategy, seed_seq, max_moves = args
+    return simulate(n_games, strategy, seed_seq, max_moves)
+
+
+def simulate_parallel(n_games: int, strategy: str = "random", seed: Optional[int] = None,
+                      processes: Optional[int] = None, batch_size: int = 50_000,
+                      max_moves: Optional[int] = None) -> SimulationResult:
+    """Split `n_games` into batches and play them on a process pool.
+
+    Each batch gets its own child of one `numpy.random.SeedSequence`, so the
+    streams are independent and the whole run is reproducible from `seed`.
+    """
+    n_batches = max(1, -(-n_games // batch_size))
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    sizes = [n_games // n_batches + (i < n_games % n_batches) for i in range(n_batches)]
+    jobs = [(size, strategy, s, max_moves) for size, s in zip(sizes, seeds)]
+
+    with multiprocessing.Pool(processes) as pool:
+        parts: List[SimulationResult] = pool.map(_simulate_batch, jobs)
+    return SimulationResult(
+        scores=np.concatenate([p.scores for p in parts]),
+        max_tiles=np.concatenate([p.max_tiles for p in parts]),
+        moves=np.concatenate([p.moves for p in parts]),
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    name = sys.argv[2] if len(sys.argv) > 2 else "random"
+    procs = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    t0 = time.perf_counter()
+    if procs > 1:
+        result = simulate_parallel(n, name, seed=0, processes=procs)
+    else:
+        result = simulate(n, name, seed=0)
+    elapsed = time.perf_counter() - t0
+
+    total_moves = int(result.moves.sum())
+    print(result.summary())
+    print(f"{n} games, {total_moves} moves in {elapsed:.2f}s "
+          f"({total_moves / elapsed:,.0f} moves/s)")
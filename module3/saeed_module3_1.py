@@ -17,24 +17,240 @@
 # You can test the endpoint using curl or any API testing tool like Postman.
 # curl -X POST "http://localhost:8000/message" -H "Content-Type: application/json" -d '{"message": "Hello, World!"}'
 # The response will include the original message and the current timestamp.
+#
+# High-volume mode:
+# - POST /messages/batch takes a JSON array of {"message": ...} objects, or an
+#   NDJSON stream (Content-Type: application/x-ndjson, one object per line).
+#   Every item is validated on its own; bad items are listed under "errors"
+#   instead of failing the whole batch.
+# - ?stream=true answers with NDJSON, one line per item, written while the
+#   request body is still being read (for very large NDJSON uploads).
+# - Responses are encoded with orjson (FastJSONResponse) when it is installed.
+# - The timestamp is a cached datetime.now().isoformat() string, refreshed
+#   at most every TIMESTAMP_RESOLUTION seconds.
+# saeed_module3_2.py reuses FastJSONResponse, coarse_timestamp and echo_batch.
+# Load test against the in-process app (needs httpx):
+#   python module3/saeed_module3_1.py bench [single|batch] [requests] [concurrency]
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+import asyncio
+import time
 from datetime import datetime
 
-app = FastAPI()
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    import json
+
+    orjson = None
+
+TIMESTAMP_RESOLUTION = 0.001
+MAX_BATCH = 100_000
+NDJSON = "application/x-ndjson"
+
+
+class FastJSONResponse(JSONResponse):
+    # orjson encodes straight to bytes, several times faster than json.dumps
+    def render(self, content):
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    # StreamingResponse may watch `receive` for a disconnect while streaming,
+    # which would swallow the request body we are still reading; a gone
+    # client shows up as a failed send instead
+    media_type = NDJSON
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+app = FastAPI(default_response_class=FastJSONResponse)
+
 
 class MessageRequest(BaseModel):
     message: str
 
+
 class MessageResponse(BaseModel):
     message: str
     timestamp: str
 
+
+_timestamp = ["", 0.0]  # [isoformat string, monotonic time it was taken]
+
+
+def coarse_timestamp():
+    now = time.monotonic()
+    if now - _timestamp[1] >= TIMESTAMP_RESOLUTION:
+        _timestamp[0] = datetime.now().isoformat()
+        _timestamp[1] = now
+    return _timestamp[0]
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj):
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
+def _check_item(item):
+    # returns the message text, or raises ValueError with the reason
+    if isinstance(item, ValueError):
+        raise item
+    if not isinstance(item, dict):
+        raise ValueError("item must be an object")
+    message = item.get("message")
+    if not isinstance(message, str):
+        raise ValueError("message must be a string")
+    return message
+
+
+def _parse_line(line):
+    try:
+        return _loads(line)
+    except ValueError:
+        return ValueError("invalid JSON")
+
+
+async def _ndjson_items(request):
+    # parses the body line by line as it arrives; bad lines become ValueError.
+    # Only the new chunk is split; the unfinished last line is kept as pieces
+    # and joined once its newline arrives, so long lines stay linear.
+    pending = []
+    async for chunk in request.stream():
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            continue
+        first, *lines, last = chunk.split(b"\n")
+        pending.append(first)
+        lines.insert(0, b"".join(pending))
+        pending = [last]
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+    tail = b"".join(pending)
+    if tail.strip():
+        yield _parse_line(tail)
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+async def _items(request):
+    # JSON arrays are read and checked up front, so a bad body is still a 400
+    # and not an error in the middle of a streamed response
+    if request.headers.get("content-type", "").startswith(NDJSON):
+        return _ndjson_items(request)
+    try:
+        items = _loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="body is not valid JSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="body must be a JSON array or NDJSON")
+    return _iterate(items)
+
+
+async def _stream_echo(items, check, field):
+    i = 0
+    async for item in items:
+        try:
+            line = {field: check(item), "timestamp": coarse_timestamp()}
+        except ValueError as e:
+            line = {"index": i, "error": str(e)}
+        yield _dumps(line) + b"\n"
+        i += 1
+
+
+async def echo_batch(request, stream=False, check=_check_item, field="message"):
+    # the /messages/batch handler, shared with saeed_module3_2.py: `check`
+    # returns an item's text or raises ValueError, echoed back under `field`
+    items = await _items(request)
+    if stream:
+        return NDJSONStreamingResponse(_stream_echo(items, check, field))
+    timestamp = coarse_timestamp()
+    results, errors = [], []
+    i = 0
+    async for item in items:
+        if i >= MAX_BATCH:
+            raise HTTPException(status_code=413, detail=f"batch larger than {MAX_BATCH} items")
+        try:
+            results.append({field: check(item), "timestamp": timestamp})
+        except ValueError as e:
+            errors.append({"index": i, "error": str(e)})
+        i += 1
+    return FastJSONResponse({"count": len(results), "messages": results, "errors": errors})
+
+
 @app.post("/message", response_model=MessageResponse)
 async def post_message(request: MessageRequest):
-    timestamp = datetime.now().isoformat()
-    return MessageResponse(message=request.message, timestamp=timestamp)
+    timestamp = coarse_timestamp()
+    return FastJSONResponse({"message": request.message, "timestamp": timestamp})
+
+
+@app.post("/messages/batch")
+async def post_messages_batch(request: Request, stream: bool = False):
+    return await echo_batch(request, stream)
+
+
+async def load_test(target=None, mode="single", requests=5000, concurrency=50, batch_size=100,
+                    field="message"):
+    # in-process load test through httpx.ASGITransport; returns req/s,
+    # messages/s and latency percentiles (ms)
+    import httpx
+
+    target = target or app
+    one = _dumps({field: "Hello, World!"})
+    many = _dumps([{field: f"Hello {i}"} for i in range(batch_size)])
+    path, body = ("/message", one) if mode == "single" else ("/messages/batch", many)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+
+        async def call():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, content=body,
+                                             headers={"content-type": "application/json"})
+                latencies.append(time.perf_counter() - start)
+                return response.status_code
+
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(call() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    per_request = 1 if mode == "single" else batch_size
+    return {
+        "mode": mode,
+        "requests": requests,
+        "ok": statuses.count(200),
+        "requests_per_s": round(requests / elapsed),
+        "messages_per_s": round(requests * per_request / elapsed),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+    }
+
 
+if __name__ == "__main__":
+    import sys
 
-   
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        modes = [sys.argv[2]] if len(sys.argv) > 2 else ["single", "batch"]
+        count = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+        concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+        for m in modes:
+            print(asyncio.run(load_test(mode=m, requests=count, concurrency=concurrency)))
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
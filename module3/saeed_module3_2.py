@@ -1,12 +1,25 @@
-
 # FastAPI application that handles POST requests to /message endpoint.
 # It validates the incoming JSON payload to ensure it contains a non-empty "Text" field.
 # If valid, it responds with the same text and a timestamp; otherwise, it returns a 422 error.
-from fastapi import FastAPI, HTTPException
+#
+# POST /messages/batch takes a JSON array of {"Text": ...} objects or an NDJSON
+# stream (Content-Type: application/x-ndjson) and applies the same check to every
+# item; items that fail are reported under "errors" with their index. Add
+# ?stream=true to get one NDJSON line per item back while the upload is still
+# being read. The batch handler, orjson responses and the cached timestamp come
+# from saeed_module3_1.py. Load test (in-process, needs httpx):
+#   python module3/saeed_module3_2.py bench [single|batch] [requests] [concurrency]
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from datetime import datetime
 
-app = FastAPI()
+try:
+    # imported as module3.saeed_module3_2, e.g. uvicorn module3.saeed_module3_2:app
+    from .saeed_module3_1 import FastJSONResponse, coarse_timestamp, echo_batch
+except ImportError:
+    # run as a script from module3/
+    from saeed_module3_1 import FastJSONResponse, coarse_timestamp, echo_batch
+
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class MessageRequest(BaseModel):
     Text: str
@@ -15,11 +28,41 @@ class MessageResponse(BaseModel):
     Text: str
     timestamp: str
 
+
+def _check_item(item):
+    # same rule as /message; returns the text or raises ValueError
+    if isinstance(item, ValueError):
+        raise item
+    text = item.get("Text") if isinstance(item, dict) else None
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Text field is missing or empty")
+    return text
+
+
 @app.post("/message", response_model=MessageResponse)
 async def post_message(request: MessageRequest):
     if not request.Text or not request.Text.strip():
         raise HTTPException(status_code=422, detail={"error": "Text field is missing or empty"})
-    timestamp = datetime.now().isoformat()
-    return MessageResponse(Text=request.Text, timestamp=timestamp)
+    return FastJSONResponse({"Text": request.Text, "timestamp": coarse_timestamp()})
+
+
+@app.post("/messages/batch")
+async def post_messages_batch(request: Request, stream: bool = False):
+    return await echo_batch(request, stream, check=_check_item, field="Text")
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
 
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from saeed_module3_1 import load_test
 
+        modes = [sys.argv[2]] if len(sys.argv) > 2 else ["single", "batch"]
+        count = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+        concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+        for m in modes:
+            print(asyncio.run(load_test(app, m, count, concurrency, field="Text")))
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
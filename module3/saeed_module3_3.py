@@ -1,13 +1,161 @@
 # note: This is a FastAPI application that responds with a greeting message.
 # It defines a single endpoint "/hello" that takes a query parameter "name".
-# When accessed, it returns a JSON response with a greeting message. 
+# When accessed, it returns a JSON response with a greeting message.
+#
+# Responses go through ResponseCacheMiddleware, a plain ASGI middleware that any
+# of the module3 FastAPI apps can use:
+#     from saeed_module3_3 import ResponseCacheMiddleware
+#     app.add_middleware(ResponseCacheMiddleware, maxsize=1024, ttl=5.0)
+# - GET 200 responses are kept in an LRU cache keyed on path + query string, and
+#   expire after `ttl` seconds;
+# - concurrent requests for the same key while it is being computed wait for
+#   that one computation instead of each calling the app (single flight);
+# - every cached response carries an ETag, and a matching If-None-Match gets an
+#   empty 304 (weak comparison: W/ prefixes are ignored, any tag in the list
+#   may match);
+# - GET /metrics returns the hit/miss/coalesced/304/eviction counters.
+# Requests with an Authorization header and responses marked no-store are never cached.
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
 
 from fastapi import FastAPI
 
+
+class ResponseCacheMiddleware:
+    def __init__(self, app, maxsize=1024, ttl=5.0, metrics_path="/metrics"):
+        self.app = app
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.metrics_path = metrics_path
+        self.cache = OrderedDict()  # key -> (expires, status, headers, body, etag)
+        self.inflight = {}          # key -> Future resolved with a cache entry
+        self.metrics = {"hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0,
+                        "evictions": 0, "bypass": 0}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == self.metrics_path:
+            await self._send_metrics(send)
+            return
+        headers = dict(scope["headers"])
+        if scope["method"] != "GET" or b"authorization" in headers:
+            self.metrics["bypass"] += 1
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"]
+        if scope["query_string"]:
+            key += "?" + scope["query_string"].decode("latin-1")
+        if_none_match = headers.get(b"if-none-match")
+
+        entry = self._lookup(key)
+        if entry is not None:
+            self.metrics["hits"] += 1
+        elif key in self.inflight:
+            self.metrics["coalesced"] += 1
+            entry = await asyncio.shield(self.inflight[key])
+        else:
+            self.metrics["misses"] += 1
+            future = asyncio.get_running_loop().create_future()
+            self.inflight[key] = future
+            try:
+                entry = await self._fetch(scope, receive)
+            except BaseException as exc:
+                future.set_exception(exc)
+                future.exception()  # waiters get it; don't warn if there are none
+                raise
+            else:
+                future.set_result(entry)
+            finally:
+                del self.inflight[key]
+            if entry[0] is not None:
+                self._store(key, entry)
+
+        await self._send_entry(entry, if_none_match, send)
+
+    def _lookup(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return entry
+
+    def _store(self, key, entry):
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    async def _fetch(self, scope, receive):
+        # runs the app and buffers its response; expires is None when the
+        # response must not be cached (it is still returned to the caller)
+        start = {}
+        body = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        content = b"".join(body)
+        headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"etag"]
+        etag = b'"' + hashlib.blake2b(content, digest_size=8).hexdigest().encode() + b'"'
+        headers.append((b"etag", etag))
+        status = start.get("status", 500)
+        cache_control = dict(start.get("headers", [])).get(b"cache-control", b"")
+        cacheable = status == 200 and b"no-store" not in cache_control
+        expires = time.monotonic() + self.ttl if cacheable else None
+        return expires, status, headers, content, etag
+
+    @staticmethod
+    def _etag_matches(if_none_match, etag):
+        # weak comparison (RFC 9110 13.1.2): W/"x" and "x" are the same tag
+        if if_none_match.strip() == b"*":
+            return True
+        for tag in if_none_match.split(b","):
+            tag = tag.strip()
+            if tag.startswith(b"W/"):
+                tag = tag[2:]
+            if tag == etag:
+                return True
+        return False
+
+    async def _send_entry(self, entry, if_none_match, send):
+        _, status, headers, body, etag = entry
+        if if_none_match and status == 200 and self._etag_matches(if_none_match, etag):
+            self.metrics["not_modified"] += 1
+            keep = (b"etag", b"cache-control", b"vary")
+            await send({"type": "http.response.start", "status": 304,
+                        "headers": [(k, v) for k, v in headers if k.lower() in keep]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _send_metrics(self, send):
+        body = json.dumps({**self.metrics, "size": len(self.cache),
+                           "inflight": len(self.inflight)}).encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+
 app = FastAPI()
+app.add_middleware(ResponseCacheMiddleware, maxsize=1024, ttl=5.0)
 
 @app.get("/hello")
 async def hello(name: str = "mohammmed"):
     return {"message": f"Hello {name}"}
-
-
@@ -1,24 +1,280 @@
 # module3/saeed_module3_4.1.py
 # This script fetches a person's data from a REST API, appends a random number to the phone number,
 # and prints the name along with the modified phone number.
-# Requirements: requests library
-# To install requests, run: pip install requests
+# Requirements: requests library (and httpx for the async client)
+# To install them, run: pip install requests httpx
 # Usage: python module3/saeed_module3_4.1.py
+#
+# The module is also a reusable client for the person API in saeed_module3_4.py:
+# - PersonClient: blocking client on one requests.Session, so connections are
+#   pooled and kept alive between calls instead of reconnecting every time.
+# - AsyncPersonClient: httpx.AsyncClient for thousands of concurrent GET/POST
+#   requests from one process, limited by max_connections.
+# Both take a timeout and record every request in a LatencyHistogram. GET, PUT
+# and DELETE are retried on connection errors, timeouts and 429/502/503/504
+# answers, with exponential backoff (full jitter). POST /person creates a new
+# person each time, so a POST is only retried when the connection could not be
+# opened, i.e. the server never saw the request.
+#
+# AsyncPersonClient.for_app(app) talks to a FastAPI app in-process through
+# httpx.ASGITransport - no server and no network needed:
+#     python module3/saeed_module3_4.1.py load 5000 200        # in-process load test
+#     python module3/saeed_module3_4.1.py load 5000 200 http://localhost:8000
 
-import requests
+import asyncio
+import bisect
 import random
+import time
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+BASE_URL = "http://localhost:8000"
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class LatencyHistogram:
+    # log-spaced buckets from 50us to ~100s, 8 per power of two
+    BOUNDS = [50e-6 * 2 ** (i / 8) for i in range(168)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        self.errors += other.errors
+
+    def percentile(self, p):
+        # upper bound of the bucket holding the p-th percentile (seconds)
+        if not self.total:
+            return 0.0
+        rank = p / 100 * self.total
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(self.BOUNDS[i], self.max) if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        ms = 1000
+        return {
+            "requests": self.total,
+            "errors": self.errors,
+            "mean_ms": round(self.sum / self.total * ms, 3) if self.total else 0.0,
+            "p50_ms": round(self.percentile(50) * ms, 3),
+            "p90_ms": round(self.percentile(90) * ms, 3),
+            "p99_ms": round(self.percentile(99) * ms, 3),
+            "max_ms": round(self.max * ms, 3),
+        }
+
+
+def _backoff_delay(backoff, attempt, max_backoff):
+    return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+
+
+def _not_sent(exc):
+    # True when requests failed before a connection existed, so nothing was sent
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+class PersonClient:
+    def __init__(self, base_url=BASE_URL, timeout=5.0, retries=3, backoff=0.05,
+                 max_backoff=2.0, pool_size=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.histogram = LatencyHistogram()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, **kwargs):
+        url = self.base_url + path
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self.histogram.errors += 1
+                if attempt == self.retries or not (idempotent or _not_sent(exc)):
+                    raise
+            else:
+                self.histogram.record(time.perf_counter() - start)
+                if (response.status_code not in RETRY_STATUSES or not idempotent
+                        or attempt == self.retries):
+                    return response
+            time.sleep(_backoff_delay(self.backoff, attempt, self.max_backoff))
+
+    def get_person(self):
+        response = self.request("GET", "/person")
+        response.raise_for_status()
+        return response.json()
+
+    def create_person(self, name, phone):
+        response = self.request("POST", "/person", json={"name": name, "phone": phone})
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncPersonClient:
+    def __init__(self, base_url=BASE_URL, timeout=5.0, retries=3, backoff=0.05,
+                 max_backoff=2.0, max_connections=100, transport=None):
+        if httpx is None:
+            raise ImportError("AsyncPersonClient requires httpx: pip install httpx")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.histogram = LatencyHistogram()
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    @classmethod
+    def for_app(cls, app, **kwargs):
+        # in-process client for an ASGI app (e.g. saeed_module3_4.app)
+        return cls(base_url="http://testserver", transport=httpx.ASGITransport(app=app), **kwargs)
+
+    async def request(self, method, path, **kwargs):
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                self.histogram.errors += 1
+                # ConnectError/ConnectTimeout: no connection, so nothing was sent
+                not_sent = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt == self.retries or not (idempotent or not_sent):
+                    raise
+            else:
+                self.histogram.record(time.perf_counter() - start)
+                if (response.status_code not in RETRY_STATUSES or not idempotent
+                        or attempt == self.retries):
+                    return response
+            await asyncio.sleep(_backoff_delay(self.backoff, attempt, self.max_backoff))
+
+    async def get_person(self):
+        response = await self.request("GET", "/person")
+        response.raise_for_status()
+        return response.json()
+
+    async def create_person(self, name, phone):
+        response = await self.request("POST", "/person", json={"name": name, "phone": phone})
+        response.raise_for_status()
+        return response.json()
+
+    async def run_many(self, calls, concurrency=100):
+        # calls: iterable of zero-argument coroutine functions, at most
+        # `concurrency` in flight; returns results/exceptions in order
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(run(c) for c in calls), return_exceptions=True)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+async def load_test(requests_count=1000, concurrency=100, base_url=None, app=None):
+    # half GETs, half POSTs; in-process against `app` when no base_url is given
+    if base_url is None:
+        if app is None:
+            from saeed_module3_4 import app
+        client = AsyncPersonClient.for_app(app, max_connections=concurrency)
+    else:
+        client = AsyncPersonClient(base_url, max_connections=concurrency)
+    async with client:
+        calls = []
+        for i in range(requests_count):
+            if i % 2:
+                calls.append(client.get_person)
+            else:
+                calls.append(lambda i=i: client.create_person(f"user{i}", f"+1555{i:07d}"))
+        start = time.perf_counter()
+        await client.run_many(calls, concurrency)
+        elapsed = time.perf_counter() - start
+    summary = client.histogram.summary()
+    summary["requests_per_s"] = round(requests_count / elapsed, 1)
+    return summary
+
+
+def main():
+    # Assuming the API is running on localhost:8000
+    with PersonClient() as client:
+        response = client.request("GET", "/person")
+    if response.status_code == 200:
+        person = response.json()
+        if person:
+            random_num = random.randint(1000, 9999)
+            modified_phone = f"{person['phone']}{random_num}"
+            print(f"Name: {person['name']}")
+            print(f"Original Phone: {person['phone']}")
+            print(f"Modified Phone: {modified_phone}")
+        else:
+            print("No person data found")
+    else:
+        print(f"Error: {response.status_code}")
+
+
+if __name__ == "__main__":
+    import sys
 
-# Assuming the API is running on localhost:8000
-response = requests.get("http://localhost:8000/person")
-if response.status_code == 200:
-    person = response.json()
-    if person:
-        random_num = random.randint(1000, 9999)
-        modified_phone = f"{person['phone']}{random_num}"
-        print(f"Name: {person['name']}")
-        print(f"Original Phone: {person['phone']}")
-        print(f"Modified Phone: {modified_phone}")
+    if len(sys.argv) > 1 and sys.argv[1] == "load":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+        concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+        url = sys.argv[4] if len(sys.argv) > 4 else None
+        print(asyncio.run(load_test(count, concurrency, url)))
     else:
-        print("No person data found")
-else:
-    print(f"Error: {response.status_code}")
\ No newline at end of file
+        main()
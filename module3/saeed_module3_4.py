@@ -2,28 +2,304 @@
 # A simple FastAPI application to create and retrieve a person's name and phone number.
 # Run this app and use POST /person to create a person and GET /person to retrieve the person's data.
 ## To run the app, use the command: uvicorn module3.saeed_moule3_4:app --reload
+#
+# People are kept in a keyed store, so every POST adds a person with its own id:
+#   POST   /person          create one person (GET /person returns the latest one)
+#   GET    /person/{id}     read, PUT replaces, DELETE removes
+#   POST   /people          bulk insert a JSON list of people
+#   GET    /people?after=&limit=   list by id; pass next_cursor back as `after`
+#
+# The storage layer is pluggable and chosen with the PERSON_STORE env var:
+#   PERSON_STORE=memory              (default) a dict plus a sorted id index -
+#                                    fast, but per process
+#   PERSON_STORE=sqlite:people.db    SQLite in WAL mode, shared by every uvicorn
+#                                    worker: uvicorn ... --workers 4
+# Benchmark (in-process, raw ASGI calls): python module3/saeed_module3_4.py bench
 
-from fastapi import FastAPI
+import asyncio
+import bisect
+import itertools
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
-app = FastAPI()
+MAX_PAGE_SIZE = 1000
+
 
 class Person(BaseModel):
     name: str
     phone: str
 
-person_data = {}
+
+class PersonStore(ABC):
+    # async storage interface; people are dicts with "id", "name", "phone"
+
+    async def create(self, person: dict) -> dict:
+        return (await self.create_many([person]))[0]
+
+    @abstractmethod
+    async def create_many(self, people: List[dict]) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get(self, person_id: int) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def update(self, person_id: int, person: dict) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def delete(self, person_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def list(self, after: int = 0, limit: int = 100) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def latest(self) -> Optional[dict]:
+        ...
+
+
+class MemoryStore(PersonStore):
+    # All methods run on the event loop and never await while changing state,
+    # so they cannot interleave and need no locks. `ids` holds the live ids in
+    # ascending order (new ids are always the largest), so list() and latest()
+    # skip deleted people instead of walking over their ids.
+    def __init__(self):
+        self.records = {}
+        self.ids = []
+        self._ids = itertools.count(1)
+
+    async def create_many(self, people: List[dict]) -> List[dict]:
+        created = []
+        for person in people:
+            person_id = next(self._ids)
+            record = self.records[person_id] = {"id": person_id, **person}
+            self.ids.append(person_id)
+            created.append(record)
+        return created
+
+    async def get(self, person_id: int) -> Optional[dict]:
+        return self.records.get(person_id)
+
+    async def update(self, person_id: int, person: dict) -> Optional[dict]:
+        if person_id not in self.records:
+            return None
+        record = self.records[person_id] = {"id": person_id, **person}
+        return record
+
+    async def delete(self, person_id: int) -> bool:
+        if self.records.pop(person_id, None) is None:
+            return False
+        del self.ids[bisect.bisect_left(self.ids, person_id)]
+        return True
+
+    async def list(self, after: int = 0, limit: int = 100) -> List[dict]:
+        start = bisect.bisect_right(self.ids, after)
+        return [self.records[i] for i in self.ids[start:start + limit]]
+
+    async def latest(self) -> Optional[dict]:
+        return self.records[self.ids[-1]] if self.ids else None
+
+
+class SQLiteStore(PersonStore):
+    # one connection per thread; queries run in the default executor
+    def __init__(self, path: str = "people.db"):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS people ("
+                       "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, phone TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def _run(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def _create_many(self, people: List[dict]) -> List[dict]:
+        db = self._connect()
+        created = []
+        with db:
+            for person in people:
+                cur = db.execute("INSERT INTO people (name, phone) VALUES (?, ?)",
+                                 (person["name"], person["phone"]))
+                created.append({"id": cur.lastrowid, **person})
+        return created
+
+    def _get(self, person_id: int) -> Optional[dict]:
+        row = self._connect().execute("SELECT id, name, phone FROM people WHERE id = ?",
+                                      (person_id,)).fetchone()
+        return dict(row) if row else None
+
+    def _update(self, person_id: int, person: dict) -> Optional[dict]:
+        db = self._connect()
+        with db:
+            cur = db.execute("UPDATE people SET name = ?, phone = ? WHERE id = ?",
+                             (person["name"], person["phone"], person_id))
+        return {"id": person_id, **person} if cur.rowcount else None
+
+    def _delete(self, person_id: int) -> bool:
+        db = self._connect()
+        with db:
+            cur = db.execute("DELETE FROM people WHERE id = ?", (person_id,))
+        return cur.rowcount > 0
+
+    def _list(self, after: int, limit: int) -> List[dict]:
+        rows = self._connect().execute(
+            "SELECT id, name, phone FROM people WHERE id > ? ORDER BY id LIMIT ?", (after, limit))
+        return [dict(r) for r in rows]
+
+    def _latest(self) -> Optional[dict]:
+        row = self._connect().execute(
+            "SELECT id, name, phone FROM people ORDER BY id DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
+
+    async def create_many(self, people):
+        return await self._run(self._create_many, people)
+
+    async def get(self, person_id):
+        return await self._run(self._get, person_id)
+
+    async def update(self, person_id, person):
+        return await self._run(self._update, person_id, person)
+
+    async def delete(self, person_id):
+        return await self._run(self._delete, person_id)
+
+    async def list(self, after=0, limit=100):
+        return await self._run(self._list, after, limit)
+
+    async def latest(self):
+        return await self._run(self._latest)
+
+
+def make_store(spec: str = "memory") -> PersonStore:
+    if spec == "memory":
+        return MemoryStore()
+    if spec.startswith("sqlite:"):
+        return SQLiteStore(spec[len("sqlite:"):] or "people.db")
+    raise ValueError(f"unknown PERSON_STORE {spec!r}; use 'memory' or 'sqlite:<path>'")
+
+
+app = FastAPI()
+store = make_store(os.environ.get("PERSON_STORE", "memory"))
+
 
 @app.post("/person")
 async def create_person(person: Person):
-    global person_data
-    person_data = person.dict()
+    person_data = await store.create(person.model_dump())
     return {"message": "Person created", "person": person_data}
 
+
 @app.get("/person")
 async def get_person():
-    return person_data
+    return await store.latest() or {}
+
+
+@app.get("/person/{person_id}")
+async def read_person(person_id: int):
+    person = await store.get(person_id)
+    if person is None:
+        raise HTTPException(status_code=404, detail="Person not found")
+    return person
+
+
+@app.put("/person/{person_id}")
+async def replace_person(person_id: int, person: Person):
+    updated = await store.update(person_id, person.model_dump())
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Person not found")
+    return updated
+
+
+@app.delete("/person/{person_id}")
+async def delete_person(person_id: int):
+    if not await store.delete(person_id):
+        raise HTTPException(status_code=404, detail="Person not found")
+    return {"message": "Person deleted", "id": person_id}
+
+
+@app.post("/people")
+async def create_people(people: List[Person]):
+    created = await store.create_many([p.model_dump() for p in people])
+    return {"message": f"{len(created)} people created", "ids": [p["id"] for p in created]}
+
+
+@app.get("/people")
+async def list_people(after: int = 0, limit: int = 100):
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    items = await store.list(after, limit)
+    next_cursor = items[-1]["id"] if len(items) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def _asgi_call(method: str, path: str, body: bytes = b"") -> int:
+    # drives `app` directly, without an HTTP client, and returns the status
+    scope = {"type": "http", "http_version": "1.1", "method": method, "path": path,
+             "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "scheme": "http", "server": ("bench", 80), "client": ("bench", 1),
+             "headers": [(b"content-type", b"application/json"),
+                         (b"content-length", str(len(body)).encode())]}
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.sleep(3600)
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def benchmark(requests_count: int = 20_000, concurrency: int = 100, people: int = 10_000):
+    # 10% POST /person, 90% GET /person/{id} over `people` preloaded records
+    await store.create_many([{"name": f"user{i}", "phone": f"+1555{i:07d}"} for i in range(people)])
+    first = (await store.list(0, 1))[0]["id"]
+    body = b'{"name": "bench", "phone": "+15550000000"}'
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            if i % 10 == 0:
+                return await _asgi_call("POST", "/person", body)
+            return await _asgi_call("GET", f"/person/{first + i % people}")
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    statuses = await asyncio.gather(*(one(i) for i in range(requests_count)))
+    elapsed = loop.time() - start
+    return {"store": type(store).__name__, "requests": requests_count,
+            "ok": statuses.count(200), "requests_per_s": round(requests_count / elapsed)}
+
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        print(asyncio.run(benchmark()))
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
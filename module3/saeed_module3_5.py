@@ -6,29 +6,361 @@
 # Required packages: Flask, logging
 # To run the application, use the command: flask run
 # Make sure to set the FLASK_APP environment variable to 'module3/saeed_module3_5.py'.
-from flask import Flask, request
+#
+# Logging does not block the request: after_request only puts the record on a
+# bounded queue (QueueHandler); a QueueListener thread takes records off in
+# batches of up to LOG_BATCH_SIZE (or whatever arrived within LOG_FLUSH_INTERVAL
+# seconds), formats them and writes each batch with one write + flush per handler.
+# - The file rotates when it reaches LOG_MAX_BYTES or every LOG_ROTATE_SECONDS,
+#   keeping LOG_BACKUP_COUNT old files (my_file.log.20240601-120000, ...).
+# - LOG_FORMAT=json writes JSON lines with method, path, status and duration_ms.
+# - LOG_POLICY=drop (default) drops records when the queue is full and counts
+#   them; LOG_POLICY=block makes the request wait for room instead. Once logging
+#   is shut down, records are dropped under either policy.
+# Benchmark (latency added per request, sync vs queued):
+#   python module3/saeed_module3_5.py bench [requests]   (plain and with a 1 ms slow disk)
+from flask import Flask, request, g
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+
+LOG_FILE = os.environ.get("LOG_FILE", "my_file.log")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+LOG_POLICY = os.environ.get("LOG_POLICY", "drop")
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10_000))
+LOG_BATCH_SIZE = int(os.environ.get("LOG_BATCH_SIZE", 256))
+LOG_FLUSH_INTERVAL = float(os.environ.get("LOG_FLUSH_INTERVAL", 0.5))
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_ROTATE_SECONDS = float(os.environ.get("LOG_ROTATE_SECONDS", 24 * 3600))
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", 5))
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    # policy "drop": never wait, count what didn't fit; "block": wait for room
+    def __init__(self, log_queue, policy="drop"):
+        super().__init__(log_queue)
+        if policy not in ("drop", "block"):
+            raise ValueError("policy must be 'drop' or 'block'")
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+
+    def prepare(self, record):
+        # the listener runs in this process, so the record can be passed as is;
+        # only merge the arguments now in case they change later
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "block":
+            # wait in short steps, so a close() while waiting lets us give up
+            while not self.closed:
+                try:
+                    self.queue.put(record, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+            self.dropped += 1
+            return
+        if self.closed:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # nothing reads the queue after shutdown, so stop feeding it
+        self.closed = True
+        super().close()
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    # emit() only formats into a buffer; flush() writes the whole batch
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self.pending = []
+
+    def emit(self, record):
+        try:
+            self.pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.pending and self.stream:
+                self.stream.write("".join(self.pending))
+                self.pending.clear()
+                self.stream.flush()
+        finally:
+            self.release()
+
+
+class RotatingBatchFileHandler(BatchStreamHandler):
+    # rotates on size or age, whichever comes first; backups are named
+    # <file>.YYYYmmdd-HHMMSS (plus .N on a clash) and only those are pruned
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, rotate_seconds=LOG_ROTATE_SECONDS,
+                 backup_count=LOG_BACKUP_COUNT):
+        self.baseFilename = os.path.abspath(filename)
+        super().__init__(open(self.baseFilename, "a", encoding="utf-8"))
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.rollover_at = time.time() + rotate_seconds
+
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self.stream and (self.stream.tell() >= self.max_bytes
+                                or time.time() >= self.rollover_at):
+                self.do_rollover()
+        finally:
+            self.release()
+
+    def do_rollover(self):
+        self.stream.close()
+        suffix = time.strftime("%Y%m%d-%H%M%S")
+        target = f"{self.baseFilename}.{suffix}"
+        n = 1
+        while os.path.exists(target):
+            target = f"{self.baseFilename}.{suffix}.{n}"
+            n += 1
+        os.replace(self.baseFilename, target)
+        directory, base = os.path.split(self.baseFilename)
+        pattern = re.compile(re.escape(base) + r"\.\d{8}-\d{6}(\.\d+)?")
+        backups = sorted((os.path.join(directory, f) for f in os.listdir(directory)
+                          if pattern.fullmatch(f)), key=os.path.getmtime)
+        for old in backups[:max(0, len(backups) - self.backup_count)]:
+            os.remove(old)
+        self.stream = open(self.baseFilename, "a", encoding="utf-8")
+        self.rollover_at = time.time() + self.rotate_seconds
+
+    def close(self):
+        self.acquire()
+        try:
+            self.flush()
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+        finally:
+            self.release()
+        logging.Handler.close(self)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    FIELDS = ("method", "path", "status", "duration_ms")
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record), "level": record.levelname,
+                 "message": record.getMessage()}
+        for field in self.FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class BatchingQueueListener:
+    # like logging.handlers.QueueListener, but takes records off the queue in
+    # batches and flushes the handlers once per batch
+    _sentinel = None
+
+    def __init__(self, log_queue, *handlers, batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.worker = None
+        self.running = False
+
+    def start(self):
+        if self.worker is not None:
+            raise RuntimeError("listener already started")
+        self.running = True
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def stop(self):
+        # processes everything queued so far, then ends the thread; safe to call twice
+        if not self.running:
+            return
+        self.running = False
+        self.queue.put(self._sentinel)
+        self.worker.join()
+
+    def handle(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _run(self):
+        q = self.queue
+        stop = False
+        while not stop:
+            try:
+                batch = [q.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait() if time.monotonic() >= deadline
+                                 else q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                    continue
+                self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            for _ in batch:
+                q.task_done()
+
+
+def setup_logging(name=__name__, filename=LOG_FILE, fmt=LOG_FORMAT, policy=LOG_POLICY,
+                  queue_size=LOG_QUEUE_SIZE, console=True, **listener_options):
+    # returns (logger, queue handler, started listener)
+    formatter = JsonLinesFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [RotatingBatchFileHandler(filename)]
+    if console:
+        handlers.append(BatchStreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, policy)
+    listener = BatchingQueueListener(log_queue, *handlers, **listener_options)
+    listener.start()
+
+    log = logging.getLogger(name)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    for old in list(log.handlers):
+        log.removeHandler(old)
+    log.addHandler(queue_handler)
+    return log, queue_handler, listener
+
+
+def shutdown_logging(listener, queue_handler=None):
+    # stops accepting records, drains the queue and flushes/closes the
+    # handlers; safe to call twice
+    if queue_handler is not None:
+        queue_handler.close()
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
 
 app = Flask(__name__)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('my_file.log'),
-        logging.StreamHandler()
-    ]
-)
+logger, queue_handler, listener = setup_logging()
+atexit.register(shutdown_logging, listener, queue_handler)
 
-logger = logging.getLogger(__name__)
+@app.before_request
+def start_timer():
+    g.start_time = time.perf_counter()
 
 @app.after_request
 def log_request(response):
-    logger.info(f"{request.method} {request.path} {response.status_code}")
+    duration_ms = round((time.perf_counter() - g.get("start_time", time.perf_counter())) * 1000, 3)
+    logger.info(f"{request.method} {request.path} {response.status_code}",
+                extra={"method": request.method, "path": request.path,
+                       "status": response.status_code, "duration_ms": duration_ms})
     return response
 
 @app.route('/')
 def hello():
     return 'Hello, World!'
 
+
+class _SlowDisk:
+    # file wrapper that waits `latency` seconds per write, like a busy disk
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data):
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def benchmark(requests_count=5000, disk_latency_ms=0.0):
+    # microseconds per request through the Flask test client: no logging,
+    # the old synchronous File+Stream handlers, and the queued pipeline;
+    # disk_latency_ms adds a delay to every write to the log file
+    import contextlib
+    import io
+    import tempfile
+
+    latency = disk_latency_ms / 1000
+
+    def run():
+        client = app.test_client()
+        client.get('/')
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            client.get('/')
+        return (time.perf_counter() - start) / requests_count * 1e6
+
+    results = {}
+    saved = list(logger.handlers)
+    console = io.StringIO()  # stands in for the terminal
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stderr(console):
+        logger.handlers = []
+        logger.disabled = True
+        results["no_logging_us"] = round(run(), 1)
+        logger.disabled = False
+
+        sync = [logging.FileHandler(os.path.join(tmp, "sync.log")), logging.StreamHandler()]
+        sync[0].stream = _SlowDisk(sync[0].stream, latency)
+        for h in sync:
+            h.setFormatter(logging.Formatter(TEXT_FORMAT))
+        logger.handlers = sync
+        results["sync_us"] = round(run(), 1)
+        for h in sync:
+            h.close()
+
+        for fmt in ("text", "json"):
+            bench_logger, handler, bench_listener = setup_logging(
+                "bench_" + fmt, os.path.join(tmp, fmt + ".log"), fmt=fmt)
+            file_handler = bench_listener.handlers[0]
+            file_handler.stream = _SlowDisk(file_handler.stream, latency)
+            logger.handlers = [handler]
+            results[f"queued_{fmt}_us"] = round(run(), 1)
+            shutdown_logging(bench_listener, handler)
+            results[f"queued_{fmt}_dropped"] = handler.dropped
+    logger.handlers = saved
+    results["added_sync_us"] = round(results["sync_us"] - results["no_logging_us"], 1)
+    results["added_queued_us"] = round(results["queued_text_us"] - results["no_logging_us"], 1)
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+        print(benchmark(count))
+        print(benchmark(count, disk_latency_ms=1.0))
+    else:
+        app.run()
@@ -1,52 +1,487 @@
-from flask import Flask, request, jsonify
+# module3/saeed_module3_6.py
+# A Flask application that serves a paginated catalogue at /items, stored in SQLite
+# (ITEMS_DB, default items.db; opened on the first request and seeded with 100
+# demo items when empty).
+#
+#   GET /items?page=2&size=10          page numbers, as before
+#   GET /items?after_id=500&size=10    keyset pagination: items with id > after_id,
+#                                      pass pagination.next_after_id back for the next page
+#   GET /items?fields=id,name          only return these columns
+#
+# Keyset pages are a primary-key range scan, so they cost the same at any depth.
+# Page numbers are turned into the same range scan while the ids have no gaps
+# (id = min_id + offset); otherwise they fall back to LIMIT/OFFSET. The gap check
+# uses live data: an exact row count kept by triggers in items_count, plus
+# MIN(id)/MAX(id), so it never trusts the cached total below.
+# total_items/total_pages come from a cached count: it is recomputed in a
+# background thread once it is older than COUNT_TTL seconds, and requests keep
+# getting the previous value meanwhile (pagination.approximate_total is true then).
+#
+# Responses are streamed: items are encoded batch by batch as they come off the
+# database cursor, so large pages start arriving before the last row is read.
+# "pagination" therefore comes after "items" in the JSON object.
+# - Accept-Encoding: br (if the brotli package is installed) or gzip compresses
+#   the stream on the fly; anything else is sent uncompressed.
+# - Accept: application/x-ndjson (or ?format=ndjson) gives one item per line and
+#   a final {"pagination": ...} line; application/msgpack (or ?format=msgpack,
+#   needs the msgpack package) gives a sequence of MessagePack maps, ending with
+#   the same pagination map.
+#
+# Benchmark, first vs deep pages:  python module3/saeed_module3_6.py bench [rows]
+# Bytes on the wire and time to first byte per page size, format and encoding:
+#   python module3/saeed_module3_6.py bench-transfer [rows]
+
+from flask import Flask, Response, request, jsonify
+import json
 import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ITEMS_DB = os.environ.get("ITEMS_DB", "items.db")
+COUNT_TTL = 30.0
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 10_000
+COLUMNS = ("id", "name", "description")
+# rows per cursor fetch, which is also one chunk of the streamed response
+FETCH_BATCH = 256
+FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "msgpack": "application/msgpack",
+}
+
+
+class ItemStore:
+    # one connection per thread, WAL so readers never wait for the writer
+    def __init__(self, path=ITEMS_DB, count_ttl=COUNT_TTL):
+        self.path = path
+        self.count_ttl = count_ttl
+        self._local = threading.local()
+        self._stats = None          # (total, min_id, max_id)
+        self._stats_at = 0.0
+        self._refreshing = threading.Lock()
+        db = self.connect()
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS items ("
+                       "id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS items_count (n INTEGER NOT NULL)")
+            db.execute("INSERT INTO items_count SELECT COUNT(*) FROM items "
+                       "WHERE NOT EXISTS (SELECT 1 FROM items_count)")
+            db.execute("CREATE TRIGGER IF NOT EXISTS items_count_insert AFTER INSERT ON items "
+                       "BEGIN UPDATE items_count SET n = n + 1; END")
+            db.execute("CREATE TRIGGER IF NOT EXISTS items_count_delete AFTER DELETE ON items "
+                       "BEGIN UPDATE items_count SET n = n - 1; END")
+
+    def connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def insert_many(self, rows, batch_size=100_000):
+        # rows: iterable of (id, name, description)
+        db = self.connect()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                with db:
+                    db.executemany("INSERT INTO items VALUES (?, ?, ?)", batch)
+                batch = []
+        if batch:
+            with db:
+                db.executemany("INSERT INTO items VALUES (?, ?, ?)", batch)
+        self._refresh_stats()
+
+    def seed_demo(self, n=100):
+        if self.stats()[0] == 0:
+            self.insert_many((i, f"Item {i}", f"Description for item {i}") for i in range(1, n + 1))
+
+    # --- cached counts ----------------------------------------------------
+
+    def _refresh_stats(self):
+        row = self.connect().execute("SELECT COUNT(*), MIN(id), MAX(id) FROM items").fetchone()
+        self._stats = (row[0], row[1] or 0, row[2] or 0)
+        self._stats_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        if not self._refreshing.acquire(blocking=False):
+            return  # already running
+
+        def run():
+            try:
+                self._refresh_stats()
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stats(self):
+        # (total, min_id, max_id, is_stale)
+        if self._stats is None:
+            self._refresh_stats()
+        stale = time.monotonic() - self._stats_at > self.count_ttl
+        if stale:
+            self._refresh_in_background()
+        return self._stats + (stale,)
+
+    # --- queries ----------------------------------------------------------
+
+    def _live_range(self):
+        # exact (count, min_id, max_id) from one statement, i.e. one snapshot;
+        # the count is a single row and MIN/MAX are index lookups
+        row = self.connect().execute(
+            "SELECT (SELECT n FROM items_count), (SELECT MIN(id) FROM items), "
+            "(SELECT MAX(id) FROM items)").fetchone()
+        return row[0], row[1] or 0, row[2] or 0
+
+    def _select(self, fields):
+        # `fields` is already checked against COLUMNS; id is always read for the cursor
+        return ", ".join(["id"] + [f for f in fields if f != "id"])
+
+    def plan(self, page=None, size=DEFAULT_PAGE_SIZE, after_id=None, extra=0):
+        # returns (sql tail, params, strategy); reads `extra` rows past the page
+        limit = size + extra
+        if after_id is not None:
+            return "WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit), "keyset"
+        total, min_id, max_id = self._live_range()
+        offset = (page - 1) * size
+        if total and max_id - min_id + 1 == total:
+            # no gaps: row number `offset` has id min_id + offset
+            return "WHERE id >= ? ORDER BY id LIMIT ?", (min_id + offset, limit), "dense"
+        return "ORDER BY id LIMIT ? OFFSET ?", (limit, offset), "offset"
+
+    def iter_page(self, fields=COLUMNS, page=None, size=DEFAULT_PAGE_SIZE, after_id=None,
+                  info=None):
+        # yields lists of up to FETCH_BATCH items; when it finishes, `info`
+        # holds last_id, has_next and the strategy used. The cursor is closed
+        # even if the consumer stops early (client gone, encoder error), so the
+        # statement doesn't keep holding a WAL read snapshot.
+        info = {} if info is None else info
+        tail, params, strategy = self.plan(page, size, after_id, extra=1)
+        info.update(last_id=None, has_next=False, strategy=strategy)
+        cursor = self.connect().execute(f"SELECT {self._select(fields)} FROM items {tail}", params)
+        try:
+            names = [d[0] for d in cursor.description]
+            left = size
+            while left:
+                rows = cursor.fetchmany(min(FETCH_BATCH, left))
+                if not rows:
+                    break
+                left -= len(rows)
+                info["last_id"] = rows[-1][0]
+                yield [{k: v for k, v in zip(names, row) if k in fields} for row in rows]
+            info["has_next"] = not left and cursor.fetchone() is not None
+        finally:
+            cursor.close()
+
+    def fetch(self, fields=COLUMNS, page=None, size=DEFAULT_PAGE_SIZE, after_id=None):
+        # returns (items, id of the last item, whether more rows follow, strategy)
+        info = {}
+        items = [item for batch in self.iter_page(fields, page, size, after_id, info)
+                 for item in batch]
+        return items, info["last_id"], info["has_next"], info["strategy"]
+
+    def explain(self, page=None, size=DEFAULT_PAGE_SIZE, after_id=None):
+        tail, params, strategy = self.plan(page, size, after_id)
+        rows = self.connect().execute(f"EXPLAIN QUERY PLAN SELECT id FROM items {tail}", params)
+        return strategy, [r[-1] for r in rows]
+
 
 app = Flask(__name__)
+store = None  # created by get_store() on first use, so importing writes nothing
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global store
+    if store is None:
+        with _store_lock:
+            if store is None:
+                new_store = ItemStore()
+                new_store.seed_demo()
+                store = new_store
+    return store
+
+
+def _parse_fields(raw):
+    if not raw:
+        return COLUMNS
+    fields = tuple(f.strip() for f in raw.split(",") if f.strip())
+    unknown = [f for f in fields if f not in COLUMNS]
+    if unknown or not fields:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _pagination(page, size, after_id, info):
+    total_items, _, _, stale = get_store().stats()
+    total_pages = math.ceil(total_items / size)
+    pagination = {
+        "page_size": size,
+        "total_items": total_items,
+        "total_pages": total_pages,
+        "approximate_total": stale,
+        "has_next": info["has_next"],
+        "next_after_id": info["last_id"] if info["has_next"] else None,
+    }
+    if after_id is not None:
+        pagination["after_id"] = after_id
+    else:
+        pagination.update({
+            "current_page": page,
+            "has_previous": page > 1,
+        })
+    return pagination
+
+
+def _choose_format():
+    name = request.args.get('format')
+    if name is None:
+        accept = request.accept_mimetypes
+        best = accept.best_match(["application/json", "application/x-ndjson",
+                                  "application/msgpack", "application/x-msgpack"],
+                                 default="application/json")
+        name = {"application/x-ndjson": "ndjson", "application/msgpack": "msgpack",
+                "application/x-msgpack": "msgpack"}.get(best, "json")
+    if name not in FORMATS:
+        raise ValueError(f"unknown format {name!r}")
+    return name
+
+
+def _choose_encoding():
+    # highest q wins; on a tie br beats gzip; identity if nothing usable
+    offered = {}
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        token, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[token.strip().lower()] = q
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = offered.get(name, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _encode(batches, fmt, meta):
+    # batches: iterable of item lists; meta() is called once they are exhausted
+    if fmt == "json":
+        yield b'{"items":['
+        first = True
+        for batch in batches:
+            if batch:
+                chunk = ",".join(_dumps(item) for item in batch)
+                yield (chunk if first else "," + chunk).encode()
+                first = False
+        yield b'],"pagination":' + _dumps(meta()).encode() + b'}\n'
+    elif fmt == "ndjson":
+        for batch in batches:
+            yield "".join(_dumps(item) + "\n" for item in batch).encode()
+        yield _dumps({"pagination": meta()}).encode() + b"\n"
+    else:
+        packer = msgpack.Packer()
+        for batch in batches:
+            yield b"".join(packer.pack(item) for item in batch)
+        yield packer.pack({"pagination": meta()})
+
+
+def _compress(chunks, encoding):
+    # each chunk is flushed, so the client can decode it as soon as it arrives
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if out:
+                yield out
+        yield compressor.flush()
+    elif encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            out = compressor.process(chunk) + compressor.flush()
+            if out:
+                yield out
+        yield compressor.finish()
+    else:
+        yield from chunks
 
-# Sample data - in a real app, this would come from a database
-items = [
-    {"id": i, "name": f"Item {i}", "description": f"Description for item {i}"}
-    for i in range(1, 101)  # 100 items for demonstration
-]
 
 @app.route('/items')
 def get_items():
     try:
         # Get pagination parameters
         page = int(request.args.get('page', 1))
-        size = int(request.args.get('size', 10))
+        size = int(request.args.get('size', DEFAULT_PAGE_SIZE))
+        after_id = request.args.get('after_id')
+        after_id = int(after_id) if after_id is not None else None
+        fields = _parse_fields(request.args.get('fields'))
+        fmt = _choose_format()
 
         # Validate parameters
         if page < 1:
             page = 1
-        if size < 1 or size > 100:
-            size = 10
-
-        # Calculate pagination
-        total_items = len(items)
-        total_pages = math.ceil(total_items / size)
-        start_index = (page - 1) * size
-        end_index = start_index + size
-
-        # Get paginated items
-        paginated_items = items[start_index:end_index]
-
-        # Create response with metadata
-        response = {
-            "items": paginated_items,
-            "pagination": {
-                "current_page": page,
-                "page_size": size,
-                "total_items": total_items,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_previous": page > 1
-            }
-        }
-
-        return jsonify(response)
+        if size < 1 or size > MAX_PAGE_SIZE:
+            size = DEFAULT_PAGE_SIZE
 
     except ValueError:
-        return jsonify({"error": "Invalid page or size parameter"}), 400
+        return jsonify({"error": "Invalid page, size, after_id, fields or format parameter"}), 400
+    if fmt == "msgpack" and msgpack is None:
+        return jsonify({"error": "MessagePack is not available (pip install msgpack)"}), 406
+
+    info = {}
+    batches = get_store().iter_page(fields, page, size, after_id, info)
+    chunks = _encode(batches, fmt, lambda: _pagination(page, size, after_id, info))
+    encoding = _choose_encoding()
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    response = Response(_compress(chunks, encoding), mimetype=FORMATS[fmt], headers=headers)
+    response.call_on_close(batches.close)
+    return response
+
+
+def benchmark(rows=10_000_000, path="items_bench.db", size=100, repeat=50):
+    # ms per request for the first, middle and last page, by page number
+    # (dense ids), by after_id, and by page number once the ids have a gap
+    # (forcing LIMIT/OFFSET)
+    global store
+    build = not os.path.exists(path)
+    bench_store = ItemStore(path)
+    if build:
+        bench_store.insert_many((i, f"Item {i}", f"Description for item {i}")
+                                for i in range(1, rows + 1))
+    rows = bench_store.stats()[0]
+    client = app.test_client()
+    saved, store = store, bench_store
+
+    def timed(query):
+        client.get(query).get_data()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            response = client.get(query)
+            response.get_data()  # the body is streamed; reading it runs the query
+        assert response.status_code == 200, response.data
+        return round((time.perf_counter() - start) / repeat * 1000, 3)
+
+    results = {"rows": rows, "plans": {}}
+    last_page = rows // size
+    try:
+        for label, page in (("first", 1), ("middle", last_page // 2), ("last", last_page)):
+            after = (page - 1) * size
+            results[f"page_{label}_ms"] = timed(f"/items?page={page}&size={size}")
+            results[f"after_id_{label}_ms"] = timed(f"/items?after_id={after}&size={size}")
+        results["plans"]["page"] = bench_store.explain(last_page, size)
+        results["plans"]["after_id"] = bench_store.explain(size=size, after_id=rows - size)
+
+        db = bench_store.connect()
+        with db:
+            gap = db.execute("SELECT * FROM items WHERE id = ?", (rows // 2,)).fetchone()
+            db.execute("DELETE FROM items WHERE id = ?", (rows // 2,))
+        bench_store._refresh_stats()
+        try:
+            for label, page in (("first", 1), ("middle", last_page // 2), ("last", last_page - 1)):
+                results[f"offset_{label}_ms"] = timed(f"/items?page={page}&size={size}")
+            results["plans"]["offset"] = bench_store.explain(last_page - 1, size)
+        finally:
+            with db:
+                db.execute("INSERT INTO items VALUES (?, ?, ?)", gap)
+            bench_store._refresh_stats()
+        results["fields_id_name_ms"] = timed(f"/items?after_id={rows // 2}&size={size}&fields=id,name")
+    finally:
+        store = saved
+    return results
+
+
+def benchmark_transfer(rows=100_000, path="items_bench_transfer.db",
+                       sizes=(100, 1_000, 10_000), repeat=5):
+    # bytes sent and time to first / last byte (ms) for each page size,
+    # format and encoding; "buffered" is the old build-then-jsonify response
+    global store
+    build = not os.path.exists(path)
+    bench_store = ItemStore(path)
+    if build:
+        bench_store.insert_many((i, f"Item {i}", f"Description for item {i}")
+                                for i in range(1, rows + 1))
+    client = app.test_client()
+    saved, store = store, bench_store
+
+    def measure(query, headers):
+        ttfb = total = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(query, headers=headers, buffered=False)
+            body = iter(response.response)
+            size = len(next(body, b""))
+            ttfb += time.perf_counter() - start
+            size += sum(len(chunk) for chunk in body)
+            total += time.perf_counter() - start
+            response.close()
+        return {"bytes": size, "ttfb_ms": round(ttfb / repeat * 1000, 2),
+                "total_ms": round(total / repeat * 1000, 2)}
+
+    def buffered(size):
+        total = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with app.test_request_context():
+                items = bench_store.fetch(COLUMNS, 1, size)[0]
+                body = jsonify({"items": items}).get_data()
+            total += time.perf_counter() - start
+        ms = round(total / repeat * 1000, 2)
+        return {"bytes": len(body), "ttfb_ms": ms, "total_ms": ms}
+
+    formats = ["json", "ndjson"] + (["msgpack"] if msgpack is not None else [])
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    results = []
+    try:
+        for size in sizes:
+            results.append({"size": size, "format": "json", "encoding": "buffered",
+                            **buffered(size)})
+            for fmt in formats:
+                for encoding in encodings:
+                    row = measure(f"/items?size={size}&format={fmt}",
+                                  {"Accept-Encoding": encoding})
+                    results.append({"size": size, "format": fmt, "encoding": encoding, **row})
+    finally:
+        store = saved
+    return results
+
 
+if __name__ == "__main__":
+    import sys
 
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000
+        print(benchmark(count, path=f"items_bench_{count}.db"))
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-transfer":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+        for row in benchmark_transfer(count, path=f"items_bench_transfer_{count}.db"):
+            print(row)
+    else:
+        app.run()